@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark
+Runs fixed display scenarios on the headless backend and reports per-frame
+latency percentiles and allocations, saved as JSON for comparing commits
+"""
+
+import gc
+import sys
+import json
+import time
+import logging
+import platform
+import subprocess
+import tracemalloc
+from config import Config
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+SHORT_TRACK = {
+    'artist': 'Wilco',
+    'song': 'Kamera',
+    'show_name': 'Expansions',
+    'host_name': 'John Gilbreath',
+    'play_type': 'trackplay',
+}
+
+SCROLLING_TRACK = {
+    'artist': 'Godspeed You! Black Emperor',
+    'song': 'Storm: Lift Yr. Skinny Fists Like Antennas to Heaven',
+    'show_name': 'Midnight in a Perfect World',
+    'host_name': 'Alex Ruder',
+    'play_type': 'trackplay',
+}
+
+AIRBREAK = {
+    'artist': '',
+    'song': '',
+    'show_name': 'Midnight in a Perfect World',
+    'host_name': 'Alex Ruder and Guest DJ Collective',
+    'play_type': 'airbreak',
+}
+
+SHOW_CHANGE_PLAYS = [
+    dict(SHORT_TRACK),
+    dict(SCROLLING_TRACK),
+    {
+        'artist': 'Sault',
+        'song': 'Wildfires',
+        'show_name': 'Sunday Soul',
+        'host_name': 'Gabriel Teodros',
+        'play_type': 'trackplay',
+    },
+    dict(AIRBREAK),
+]
+
+
+def _show_change_play(frame):
+    """Switch to the next show/track every 50 frames (5 seconds at 10 FPS)"""
+    return SHOW_CHANGE_PLAYS[(frame // 50) % len(SHOW_CHANGE_PLAYS)]
+
+
+# Scenario name -> (play for frame index, airbreak logo toggle, static)
+# Static scenarios never change on screen, so they would draw one frame and
+# then only time the unchanged-frame skip; they always redraw every frame
+SCENARIOS = {
+    'short_track': (lambda frame: SHORT_TRACK, False, True),
+    'scrolling_lines': (lambda frame: SCROLLING_TRACK, False, False),
+    'airbreak_info': (lambda frame: AIRBREAK, False, False),
+    'airbreak_logo': (lambda frame: AIRBREAK, True, True),
+    'show_change': (_show_change_play, False, False),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(values):
+    """p50/p95/p99/mean/max of a list of numbers"""
+    ordered = sorted(values)
+    return {
+        'p50': percentile(ordered, 0.50),
+        'p95': percentile(ordered, 0.95),
+        'p99': percentile(ordered, 0.99),
+        'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+        'max': ordered[-1] if ordered else 0.0,
+    }
+
+
+def histogram(values, bucket_width):
+    """Count values into fixed-width buckets, keyed by bucket lower bound"""
+    buckets = {}
+    for value in values:
+        bucket = int(value // bucket_width) * bucket_width
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+    return {f"{bucket:g}": buckets[bucket] for bucket in sorted(buckets)}
+
+
+def make_renderer(config, airbreak_logo, frames):
+    """Create a headless renderer pinned to the scenario's airbreak display"""
+    from display.renderer import DisplayRenderer
+
+    renderer = DisplayRenderer(config)
+    if renderer.backend != 'headless':
+        raise RuntimeError("Headless backend unavailable - install numpy (and pillow for text strips)")
+
+    renderer.airbreak_display_toggle = airbreak_logo
+    # Keep the airbreak display from toggling mid-run
+    renderer.airbreak_toggle_frames = frames + 1
+    return renderer
+
+
+def run_scenario(config, name, frames, force_redraw=False):
+    """Run one scenario for N frames, timing pass then allocation pass"""
+    play_for_frame, airbreak_logo, static = SCENARIOS[name]
+    force_redraw = force_redraw or static
+
+    # Timing pass (no tracing overhead)
+    renderer = make_renderer(config, airbreak_logo, frames)
+    frame_times = []
+    drawn_times = []
+    skipped_times = []
+    gc.collect()
+    for frame in range(frames):
+        play = play_for_frame(frame)
+        if force_redraw:
+            renderer._last_frame_key = None
+        swaps = renderer.matrix.swaps
+        start = time.perf_counter_ns()
+        renderer.render_now_playing(play)
+        elapsed = (time.perf_counter_ns() - start) / 1e6
+        frame_times.append(elapsed)
+        # Drawn and skipped (unchanged) frames cost very different amounts
+        (drawn_times if renderer.matrix.swaps != swaps else skipped_times).append(elapsed)
+    drawn_frames = renderer.matrix.swaps
+    renderer.cleanup()
+
+    # Allocation pass
+    renderer = make_renderer(config, airbreak_logo, frames)
+    alloc_bytes = []
+    alloc_blocks = []
+    gc.collect()
+    tracemalloc.start()
+    for frame in range(frames):
+        play = play_for_frame(frame)
+        if force_redraw:
+            renderer._last_frame_key = None
+        tracemalloc.reset_peak()
+        current_before, _ = tracemalloc.get_traced_memory()
+        blocks_before = sys.getallocatedblocks()
+        renderer.render_now_playing(play)
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_bytes.append(peak - current_before)
+        alloc_blocks.append(sys.getallocatedblocks() - blocks_before)
+    tracemalloc.stop()
+    renderer.cleanup()
+
+    return {
+        'frames': frames,
+        'drawn_frames': drawn_frames,
+        'forced_redraw': force_redraw,
+        'frame_ms': summarize(frame_times),
+        'drawn_frame_ms': summarize(drawn_times),
+        'skipped_frame_ms': summarize(skipped_times),
+        'frame_ms_histogram': histogram(frame_times, 0.5),
+        'alloc_peak_bytes': summarize(alloc_bytes),
+        'alloc_net_blocks': summarize(alloc_blocks),
+    }
+
+
+def git_revision():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def print_results(results, baseline=None):
+    """Print a summary table, with p50/p95 ratios against a baseline run"""
+    print(f"{'scenario':<18}{'drawn':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'drawn p95':>11}{'alloc p95':>12}")
+    for name, result in results['scenarios'].items():
+        frame_ms = result['frame_ms']
+        drawn_ms = result.get('drawn_frame_ms') or frame_ms
+        line = (f"{name:<18}{result['drawn_frames']:>8}{frame_ms['p50']:>10.3f}"
+                f"{frame_ms['p95']:>10.3f}{frame_ms['p99']:>10.3f}{drawn_ms['p95']:>11.3f}"
+                f"{result['alloc_peak_bytes']['p95']:>12.0f}")
+        previous = (baseline or {}).get('scenarios', {}).get(name)
+        if previous and previous['frame_ms']['p50'] and previous['frame_ms']['p95']:
+            line += (f"   p50 x{frame_ms['p50'] / previous['frame_ms']['p50']:.2f}"
+                     f" p95 x{frame_ms['p95'] / previous['frame_ms']['p95']:.2f}")
+        print(line)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the display render path on the headless backend',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run all scenarios for 1000 frames and save results
+  python3 benchmark_render.py --font fonts/6x9.bdf --output bench.json
+
+  # Compare against a previous run
+  python3 benchmark_render.py --font fonts/6x9.bdf --compare bench.json
+        """
+    )
+
+    parser.add_argument('--frames', type=int, default=1000,
+                        help='Frames to render per scenario (default: 1000)')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable, default: all)')
+    parser.add_argument('--font', default=None,
+                        help='BDF font to render with (default: FONT_PATH)')
+    parser.add_argument('--force-redraw', action='store_true',
+                        help='Redraw every frame even when nothing changed')
+    parser.add_argument('--output', default=None,
+                        help='Write results as JSON to this file')
+    parser.add_argument('--compare', default=None,
+                        help='JSON results from a previous run to compare against')
+
+    args = parser.parse_args()
+
+    config = Config()
+    config.display_backend = 'headless'
+    if args.font:
+        config.font_path = args.font
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'matrix': f"{config.matrix_cols * config.matrix_chain_length}x{config.matrix_rows * config.matrix_parallel}",
+        'force_redraw': args.force_redraw,
+        'scenarios': {},
+    }
+
+    for name in args.scenario or list(SCENARIOS):
+        results['scenarios'][name] = run_scenario(config, name, args.frames, args.force_redraw)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
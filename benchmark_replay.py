@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Replay Benchmark
+Runs a recorded play stream through fetch, show resolution and render on the
+headless backend in simulated time, and reports reproducible numbers for
+comparing commits
+"""
+
+import gc
+import sys
+import json
+import time
+import logging
+import platform
+from pathlib import Path
+from config import Config
+from benchmark_render import summarize, git_revision
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Synthetic recordings start at a fixed time so every run sees the same day
+SYNTHETIC_START = 1714546800  # 2024-05-01T00:00:00-07:00
+
+# How long after a play starts the synthetic recording "sees" it
+SYNTHETIC_POLL_DELAY = 5
+
+
+def synthesize_recording(path, hours):
+    """
+    Write a recording of `hours` of the mock API's looped fixture plays
+
+    Uses scripts/fixtures and the timeline of scripts/mock_kexp_api.py, so
+    a benchmark can run without first recording a day of the live API.
+    """
+    sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+    from mock_kexp_api import FIXTURES_DIR, load_fixtures, PlayTimeline, MockKEXPAPI
+    from kexp.api_client import KEXPClient, PLAY_CHANGED
+    from kexp.replay import PlayRecorder
+
+    plays, shows = load_fixtures(FIXTURES_DIR)
+    timeline = PlayTimeline(plays, started=SYNTHETIC_START)
+    api = MockKEXPAPI(timeline, shows)
+
+    now = [SYNTHETIC_START]
+    recorder = PlayRecorder(path, clock=lambda: now[0])
+    first = k = timeline.index_at(SYNTHETIC_START)
+    try:
+        while timeline.start_of(k) < SYNTHETIC_START + hours * 3600:
+            # The play on air at the start is seen by the first poll
+            now[0] = max(SYNTHETIC_START, timeline.start_of(k) + SYNTHETIC_POLL_DELAY)
+            play = KEXPClient._parse_play(timeline.play(k))
+            recorder.record_plays(PLAY_CHANGED, [play])
+            details = api.show(play['show'], now[0])
+            if details is not None:
+                recorder.record_show(play['show'], KEXPClient._parse_show(details))
+            k += 1
+    finally:
+        recorder.close()
+    return k - first
+
+
+def make_renderer(config):
+    """Create a headless renderer"""
+    from display.renderer import DisplayRenderer
+
+    renderer = DisplayRenderer(config)
+    if renderer.backend != 'headless':
+        raise RuntimeError("Headless backend unavailable - install numpy (and pillow for text strips)")
+    return renderer
+
+
+def run_replay(config, path, frame_step):
+    """
+    Replay a recording end to end on a simulated clock
+
+    The clock advances `frame_step` seconds per rendered frame, and the
+    fetcher polls whenever its poll scheduler's interval has elapsed on
+    that clock, exactly as it would live.
+    """
+    from kexp.fetcher import PlayFetcher
+    from kexp.replay import Recording, ReplayClient, ReplayClock
+
+    recording = Recording(path)
+    clock = ReplayClock(recording.started)
+    client = ReplayClient(recording, clock=clock)
+    fetcher = PlayFetcher(config, client=client, clock=clock)
+    renderer = make_renderer(config)
+    seen_at = {play.get('play_id'): t for t, play in zip(recording.play_times, recording.plays)}
+
+    fetch_times = []
+    frame_times = []
+    latencies = []
+    polls = 0
+    published = 0
+    snapshot = None
+    next_poll = clock()
+
+    gc.collect()
+    started = time.perf_counter()
+    while clock() <= recording.ended:
+        now = clock()
+        if now >= next_poll:
+            start = time.perf_counter_ns()
+            fetcher.fetch_new_data()
+            fetch_times.append((time.perf_counter_ns() - start) / 1e6)
+            polls += 1
+            next_poll = now + fetcher.poll_scheduler.next_interval()
+
+        if fetcher.snapshot is not snapshot:
+            snapshot = fetcher.snapshot
+            published += 1
+            # Seconds between the recorded client seeing the play and this run showing it
+            if snapshot.get('play_id') in seen_at:
+                latencies.append(now - seen_at[snapshot['play_id']])
+
+        if snapshot:
+            start = time.perf_counter_ns()
+            renderer.render_now_playing(snapshot)
+            frame_times.append((time.perf_counter_ns() - start) / 1e6)
+
+        clock.advance(frame_step)
+    wall = time.perf_counter() - started
+
+    drawn_frames = renderer.matrix.swaps
+    renderer.cleanup()
+
+    return {
+        'recording': str(path),
+        'replayed_hours': recording.duration / 3600,
+        'wall_seconds': wall,
+        'speedup': recording.duration / wall if wall else 0.0,
+        'plays_recorded': len(recording.plays),
+        'snapshots_published': published,
+        'polls': polls,
+        'api_requests': dict(client.requests),
+        'show_cache': client.show_cache.stats(),
+        'poll_stats': fetcher.poll_scheduler.stats(),
+        'display_latency_s': summarize(latencies),
+        'fetch_ms': summarize(fetch_times),
+        'frames': len(frame_times),
+        'drawn_frames': drawn_frames,
+        'frame_ms': summarize(frame_times),
+    }
+
+
+def print_results(results, baseline=None):
+    """Print a summary, with ratios against a baseline run"""
+    result = results['replay']
+    previous = (baseline or {}).get('replay') or {}
+
+    def ratio(key, field):
+        before = (previous.get(key) or {}).get(field)
+        return f"   x{result[key][field] / before:.2f}" if before else ''
+
+    print(f"Replayed {result['replayed_hours']:.1f}h in {result['wall_seconds']:.1f}s "
+          f"({result['speedup']:.0f}x)")
+    print(f"Plays: {result['plays_recorded']} recorded, {result['snapshots_published']} published; "
+          f"{result['polls']} polls, API requests {result['api_requests']}")
+    print(f"Show cache hit rate: {result['show_cache']['hit_rate']:.1%}")
+    latency = result['display_latency_s']
+    print(f"Display latency: p50 {latency['p50']:.1f}s  p95 {latency['p95']:.1f}s  max {latency['max']:.1f}s")
+    fetch = result['fetch_ms']
+    print(f"Fetch: p50 {fetch['p50']:.3f}ms  p95 {fetch['p95']:.3f}ms" + ratio('fetch_ms', 'p95'))
+    frame = result['frame_ms']
+    print(f"Frames: {result['frames']} rendered, {result['drawn_frames']} drawn; "
+          f"p50 {frame['p50']:.3f}ms  p95 {frame['p95']:.3f}ms" + ratio('frame_ms', 'p95'))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Replay a recorded play stream through fetch, resolve and render',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Record a day of the live API (any display backend works)
+  RECORD_FILE=day.jsonl.gz DISPLAY_BACKEND=simulation python3 kexp_display.py
+
+  # Replay it and save results
+  python3 benchmark_replay.py day.jsonl.gz --font fonts/6x9.bdf --output replay.json
+
+  # Compare against a previous run, using a synthetic day from the mock fixtures
+  python3 benchmark_replay.py --synthetic 24 --compare replay.json
+        """
+    )
+
+    parser.add_argument('recording', nargs='?', default=None,
+                        help='Recording written with RECORD_FILE')
+    parser.add_argument('--synthetic', type=float, default=None, metavar='HOURS',
+                        help='Replay HOURS of the mock API fixtures instead of a recording')
+    parser.add_argument('--frame-step', type=float, default=1.0,
+                        help='Simulated seconds per rendered frame (default: 1.0)')
+    parser.add_argument('--font', default=None,
+                        help='BDF font to render with (default: FONT_PATH)')
+    parser.add_argument('--output', default=None,
+                        help='Write results as JSON to this file')
+    parser.add_argument('--compare', default=None,
+                        help='JSON results from a previous run to compare against')
+
+    args = parser.parse_args()
+    if not args.recording and not args.synthetic:
+        parser.error('give a recording or --synthetic HOURS')
+
+    config = Config()
+    config.display_backend = 'headless'
+    if args.font:
+        config.font_path = args.font
+
+    path = args.recording
+    if args.synthetic:
+        import tempfile
+        path = Path(tempfile.mkdtemp()) / 'synthetic.jsonl.gz'
+        plays = synthesize_recording(path, args.synthetic)
+        print(f"Synthesized {plays} plays over {args.synthetic:g}h")
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'matrix': f"{config.matrix_cols * config.matrix_chain_length}x{config.matrix_rows * config.matrix_parallel}",
+        'adaptive_polling': config.adaptive_polling,
+        'incremental_sync': config.incremental_sync,
+        'frame_step': args.frame_step,
+        'replay': run_replay(config, path, args.frame_step),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,59 @@ import os
 class Config:
     """Configuration class for KEXP Display"""
 
-    # KEXP API settings
-    KEXP_API_BASE = "https://api.kexp.org/v2"
+    # KEXP API root (point at scripts/mock_kexp_api.py to develop offline)
+    KEXP_API_BASE = os.getenv('KEXP_API_BASE', 'https://api.kexp.org/v2')
 
-    # Update interval in seconds
+    # Local SQLite play history (empty to disable) and how long to keep plays
+    history_db = os.getenv('HISTORY_DB', 'kexp_history.db')
+    history_retention_days = int(os.getenv('HISTORY_RETENTION_DAYS', '30'))
+
+    # Last play and show details kept on disk for warm restarts (empty to disable)
+    state_cache = os.getenv('STATE_CACHE', 'kexp_state.json')
+
+    # Update interval in seconds (the fixed poll interval, and the baseline
+    # adaptive polling reports requests saved against)
     update_interval = int(os.getenv('UPDATE_INTERVAL', '10'))
 
+    # Poll faster around play changes and slower mid-track, within these bounds
+    adaptive_polling = os.getenv('ADAPTIVE_POLLING', 'true').lower() in ('1', 'true', 'yes')
+    poll_min_interval = int(os.getenv('POLL_MIN_INTERVAL', '5'))
+    poll_max_interval = int(os.getenv('POLL_MAX_INTERVAL', '30'))
+
+    # Target render frame rate (frames per second, at least 1; may be fractional)
+    frame_rate = max(1.0, float(os.getenv('FRAME_RATE', '10')))
+
+    # Display backend: 'auto' (matrix if available, else simulation),
+    # 'matrix', 'headless' (NumPy framebuffer) or 'simulation'
+    display_backend = os.getenv('DISPLAY_BACKEND', 'auto')
+
+    # Seconds between frame-stat heartbeat lines in simulation mode (0 = off)
+    simulation_heartbeat = int(os.getenv('SIMULATION_HEARTBEAT', '0'))
+
+    # Fast start: show the logo as soon as the matrix is up and load fonts
+    # while the first API request is in flight
+    fast_start = os.getenv('FAST_START', 'true').lower() in ('1', 'true', 'yes')
+
+    # BDF font to try before the default rpi-rgb-led-matrix fonts
+    font_path = os.getenv('FONT_PATH', '')
+
+    # Fetch every play newer than the last one seen instead of only the latest
+    incremental_sync = os.getenv('INCREMENTAL_SYNC', 'true').lower() in ('1', 'true', 'yes')
+
+    # Record every play and show the API returns to this file (.gz to
+    # compress), or replay a recording instead of polling the API, at
+    # REPLAY_SPEED times real time (at least 0.1)
+    record_file = os.getenv('RECORD_FILE', '')
+    replay_file = os.getenv('REPLAY_FILE', '')
+    replay_speed = max(0.1, float(os.getenv('REPLAY_SPEED', '1')))
+
+    # Share one poller between displays: 'publish' polls the API and
+    # broadcasts snapshots, 'subscribe' renders them instead of polling,
+    # empty runs standalone. Address is unix:/path or udp://group:port; the
+    # default socket is under /run, where only root can create it
+    broadcast_mode = os.getenv('BROADCAST_MODE', '')
+    broadcast_address = os.getenv('BROADCAST_ADDRESS', 'unix:/run/kexp-display.sock')
+
     # Display settings
     matrix_rows = int(os.getenv('MATRIX_ROWS', '32'))
     matrix_cols = int(os.getenv('MATRIX_COLS', '64'))
@@ -0,0 +1,140 @@
+"""
+BDF Font Reader
+Parses the bitmap fonts used by rpi-rgb-led-matrix so text can be rasterized off-screen
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# rpi-rgb-led-matrix draws U+FFFD for codepoints missing from the font
+REPLACEMENT_CODEPOINT = 0xFFFD
+
+# Measured strings kept per font before the width cache is reset
+WIDTH_CACHE_SIZE = 256
+
+
+class Glyph:
+    """A single BDF glyph: advance width, bounding box and bitmap rows"""
+
+    def __init__(self, device_width, width, height, y_offset, rows):
+        self.device_width = device_width
+        self.width = width
+        self.height = height
+        self.y_offset = y_offset
+        self.rows = rows  # list of (row bits, bit count) from the BITMAP section
+
+
+class BDFFont:
+    """
+    Glyph bitmaps and metrics parsed from a BDF file
+
+    Placement follows rpi-rgb-led-matrix's graphics.DrawText: the y passed to
+    draw_text() is the baseline, the glyph's BBX x offset is ignored and the
+    pen advances by DWIDTH.
+    """
+
+    def __init__(self, glyphs, height, baseline):
+        self.glyphs = glyphs  # codepoint -> Glyph
+        self.height = height
+        self.baseline = baseline  # rows from the top of the font box to the baseline
+        # codepoint -> advance (DWIDTH), so measuring never touches the bitmaps
+        self.advances = {codepoint: glyph.device_width for codepoint, glyph in glyphs.items()}
+        replacement = glyphs.get(REPLACEMENT_CODEPOINT)
+        self.missing_advance = replacement.device_width if replacement is not None else 0
+        self._widths = {}  # text -> width in pixels
+
+    @classmethod
+    def load(cls, path):
+        """Parse a BDF file from disk"""
+        glyphs = {}
+        height = 0
+        baseline = 0
+
+        codepoint = None
+        device_width = 0
+        bbx = (0, 0, 0, 0)
+        rows = None
+
+        with open(path, 'r', encoding='latin-1') as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                keyword = parts[0]
+
+                if rows is not None:
+                    if keyword == 'ENDCHAR':
+                        if codepoint is not None and codepoint >= 0:
+                            glyphs[codepoint] = Glyph(device_width, bbx[0], bbx[1], bbx[3], rows)
+                        rows = None
+                    else:
+                        rows.append((int(keyword, 16), len(keyword) * 4))
+                elif keyword == 'FONTBOUNDINGBOX':
+                    height = int(parts[2])
+                    baseline = height + int(parts[4])
+                elif keyword == 'ENCODING':
+                    codepoint = int(parts[1])
+                elif keyword == 'DWIDTH':
+                    device_width = int(parts[1])
+                elif keyword == 'BBX':
+                    bbx = tuple(int(p) for p in parts[1:5])
+                elif keyword == 'BITMAP':
+                    rows = []
+
+        logger.info(f"Parsed {len(glyphs)} glyphs from {path}")
+        return cls(glyphs, height, baseline)
+
+    def glyph(self, codepoint):
+        """Return the glyph for a codepoint, the replacement glyph, or None"""
+        glyph = self.glyphs.get(codepoint)
+        if glyph is None:
+            glyph = self.glyphs.get(REPLACEMENT_CODEPOINT)
+        return glyph
+
+    def text_width(self, text):
+        """
+        Width in pixels that graphics.DrawText would advance for text
+
+        The same few strings (artist, song, show, separators) are measured
+        every frame, so results are memoized.
+        """
+        width = self._widths.get(text)
+        if width is None:
+            advances = self.advances
+            missing = self.missing_advance
+            width = sum(advances.get(ord(char), missing) for char in text)
+            if len(self._widths) >= WIDTH_CACHE_SIZE:
+                self._widths.clear()
+            self._widths[text] = width
+        return width
+
+    def draw_text(self, mask, mask_width, x, text):
+        """
+        Rasterize text into a one-byte-per-pixel mask that is `height` rows tall
+
+        Lit pixels are set to 255. Pixels outside the mask are clipped.
+
+        Returns:
+            The x position after the last glyph
+        """
+        mask_height = len(mask) // mask_width if mask_width else 0
+        for char in text:
+            glyph = self.glyph(ord(char))
+            if glyph is None:
+                continue
+
+            top = self.baseline - glyph.height - glyph.y_offset
+            for row_idx, (bits, bit_count) in enumerate(glyph.rows):
+                py = top + row_idx
+                if not 0 <= py < mask_height or not bits:
+                    continue
+                row_start = py * mask_width
+                for col in range(glyph.width):
+                    if bits >> (bit_count - 1 - col) & 1:
+                        px = x + col
+                        if 0 <= px < mask_width:
+                            mask[row_start + px] = 255
+
+            x += glyph.device_width
+        return x
@@ -3,6 +3,9 @@ Color schemes for different KEXP shows
 Each show has a unique, carefully crafted color palette
 """
 
+from functools import lru_cache
+
+
 class ColorScheme:
     """Represents a color scheme with artist, song, and info colors"""
     def __init__(self, name, artist_color, song_color, info_color):
@@ -291,34 +294,52 @@ SHOW_COLOR_MAPPING = {
 }
 
 
+# Resolver index compiled once at import from SHOW_COLOR_MAPPING.
+# Built in reverse so that, as when the mapping was walked on every lookup,
+# the first show whose lowercased name matches wins.
+_NORMALIZED_SHOWS = {
+    show_key.lower(): scheme_name for show_key, scheme_name in reversed(SHOW_COLOR_MAPPING.items())
+}
+_SUBSTRING_SHOWS = tuple(
+    (show_key.lower(), scheme_name) for show_key, scheme_name in SHOW_COLOR_MAPPING.items()
+)
+
+
+@lru_cache(maxsize=256)
+def _resolve_scheme_name(show_name):
+    """Resolve a non-empty show name to a COLOR_SCHEMES key (memoized)"""
+    # Try exact match first (case sensitive)
+    if show_name in SHOW_COLOR_MAPPING:
+        return SHOW_COLOR_MAPPING[show_name]
+
+    # Try case-insensitive exact match
+    show_lower = show_name.lower()
+    if show_lower in _NORMALIZED_SHOWS:
+        return _NORMALIZED_SHOWS[show_lower]
+
+    # Try partial match (case insensitive)
+    for show_key, scheme_name in _SUBSTRING_SHOWS:
+        if show_key in show_lower or show_lower in show_key:
+            return scheme_name
+
+    # Default fallback
+    return 'kexp_default'
+
+
 def get_color_scheme_for_show(show_name):
     """
     Get the appropriate color scheme for a given show name
-    
+
+    Resolution is memoized per show name, so calling this every frame
+    costs a single dict lookup after the first call.
+
     Args:
         show_name: Name of the show
-        
+
     Returns:
         ColorScheme object
     """
     if not show_name:
         return COLOR_SCHEMES['kexp_default']
-    
-    # Try exact match first (case sensitive)
-    if show_name in SHOW_COLOR_MAPPING:
-        scheme_name = SHOW_COLOR_MAPPING[show_name]
-        return COLOR_SCHEMES[scheme_name]
-    
-    # Try case-insensitive exact match
-    show_lower = show_name.lower()
-    for show_key, scheme_name in SHOW_COLOR_MAPPING.items():
-        if show_key.lower() == show_lower:
-            return COLOR_SCHEMES[scheme_name]
-    
-    # Try partial match (case insensitive)
-    for show_key, scheme_name in SHOW_COLOR_MAPPING.items():
-        if show_key.lower() in show_lower or show_lower in show_key.lower():
-            return COLOR_SCHEMES[scheme_name]
-    
-    # Default fallback
-    return COLOR_SCHEMES['kexp_default']
+
+    return COLOR_SCHEMES[_resolve_scheme_name(show_name)]
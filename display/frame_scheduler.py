@@ -0,0 +1,116 @@
+"""
+Frame Scheduler
+Paces the render loop against a monotonic clock at a fixed target frame rate
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FrameScheduler:
+    """
+    Deadline-based frame pacing with drift compensation
+
+    Deadlines are spaced exactly one frame period apart on a monotonic clock,
+    so time spent rendering is absorbed instead of added to every frame. A
+    frame that finishes after its deadline is an overrun: if the loop is
+    only a little behind, the next frames start immediately to catch up;
+    once it falls more than `max_catchup_frames` behind, the missed frames
+    are dropped and the schedule restarts from the next slot.
+    """
+
+    def __init__(self, fps, max_catchup_frames=2, report_interval=60,
+                 clock=time.monotonic, sleep=time.sleep):
+        if not fps > 0:
+            raise ValueError(f"Frame rate must be positive, got {fps!r}")
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.max_catchup_frames = max_catchup_frames
+        self.report_interval = report_interval
+        self._clock = clock
+        self._sleep = sleep
+
+        self._next_deadline = None
+        self._window_start = None
+        self._window_frames = 0
+        self._window_overruns = 0
+        self._window_dropped = 0
+
+        self.frames = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.achieved_fps = 0.0
+
+    def start(self):
+        """Reset the schedule so the first deadline is one period from now"""
+        now = self._clock()
+        self._next_deadline = now + self.period
+        self._window_start = now
+        self._window_frames = 0
+        self._window_overruns = 0
+        self._window_dropped = 0
+
+    def wait_for_next_frame(self):
+        """
+        Sleep until the next frame deadline
+
+        Returns:
+            Number of frames dropped to get back on schedule (usually 0)
+        """
+        if self._next_deadline is None:
+            self.start()
+
+        now = self._clock()
+        dropped = 0
+        self.frames += 1
+        self._window_frames += 1
+
+        if now < self._next_deadline:
+            self._sleep(self._next_deadline - now)
+            self._next_deadline += self.period
+        else:
+            self.overruns += 1
+            self._window_overruns += 1
+            behind = int((now - self._next_deadline) / self.period)
+            if behind > self.max_catchup_frames:
+                # Too far behind to catch up: skip the missed slots
+                dropped = behind
+                self.dropped += dropped
+                self._window_dropped += dropped
+                self._next_deadline += (behind + 1) * self.period
+            else:
+                # Start the next frame immediately to catch up
+                self._next_deadline += self.period
+
+        self._maybe_report()
+        return dropped
+
+    def stats(self):
+        """Return frame counters and the most recently measured frame rate"""
+        return {
+            'target_fps': self.fps,
+            'achieved_fps': self.achieved_fps,
+            'frames': self.frames,
+            'overruns': self.overruns,
+            'dropped': self.dropped,
+        }
+
+    def _maybe_report(self):
+        """Log achieved FPS and overruns once per report interval"""
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self.report_interval:
+            return
+
+        self.achieved_fps = self._window_frames / elapsed
+        logger.info(
+            f"Frame stats: {self.achieved_fps:.2f} fps (target {self.fps:g}), "
+            f"{self._window_overruns} overruns, {self._window_dropped} dropped "
+            f"in the last {elapsed:.0f}s"
+        )
+        self._window_start = now
+        self._window_frames = 0
+        self._window_overruns = 0
+        self._window_dropped = 0
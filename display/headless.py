@@ -0,0 +1,144 @@
+"""
+Headless Matrix Backend
+NumPy framebuffer implementation of the rgbmatrix surface used by the renderer,
+so the real render path can run, be profiled and be inspected off-device
+"""
+
+import numpy as np
+from display.bdf import BDFFont
+
+
+class RGBMatrixOptions:
+    """Stand-in for rgbmatrix.RGBMatrixOptions (only the geometry is used)"""
+
+    def __init__(self):
+        self.rows = 32
+        self.cols = 32
+        self.chain_length = 1
+        self.parallel = 1
+        self.hardware_mapping = 'regular'
+        self.brightness = 100
+        self.gpio_slowdown = 1
+        self.disable_hardware_pulsing = False
+
+
+class FrameCanvas:
+    """An off-screen canvas backed by a (rows, cols, 3) uint8 array"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def SetPixel(self, x, y, red, green, blue):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = (red, green, blue)
+
+    def Clear(self):
+        self.pixels.fill(0)
+
+    def Fill(self, red, green, blue):
+        self.pixels[:, :] = (red, green, blue)
+
+    def SetImage(self, image, offset_x=0, offset_y=0, unsafe=True):
+        """Copy a Pillow RGB image onto the canvas, clipped to the canvas bounds"""
+        if image.mode != 'RGB':
+            raise ValueError("Currently, only RGB mode is supported for SetImage().")
+
+        source = np.asarray(image)
+        x0, y0 = max(0, offset_x), max(0, offset_y)
+        x1 = min(self.width, offset_x + source.shape[1])
+        y1 = min(self.height, offset_y + source.shape[0])
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = source[y0 - offset_y:y1 - offset_y, x0 - offset_x:x1 - offset_x]
+
+
+class RGBMatrix(FrameCanvas):
+    """
+    Stand-in for rgbmatrix.RGBMatrix
+
+    Like the real matrix, the object itself is a drawable canvas and
+    SwapOnVSync() shows the given canvas and hands back the previous one.
+    """
+
+    def __init__(self, options=None):
+        options = options or RGBMatrixOptions()
+        super().__init__(options.cols * options.chain_length, options.rows * options.parallel)
+        self.options = options
+        self.front = self
+        self.swaps = 0
+
+    def CreateFrameCanvas(self):
+        return FrameCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas, framerate_fraction=1):
+        previous = self.front
+        self.front = canvas
+        self.swaps += 1
+        return previous
+
+    def snapshot(self):
+        """Return a copy of the framebuffer currently being displayed"""
+        return self.front.pixels.copy()
+
+
+class graphics:
+    """Stand-in for rgbmatrix.graphics backed by the BDF reader"""
+
+    class Font:
+        def __init__(self):
+            self.bdf = None
+            self.height = 0
+            self.baseline = 0
+            self._masks = {}  # codepoint -> (Glyph, bool array) or None
+
+        def LoadFont(self, path):
+            self.bdf = BDFFont.load(path)
+            self.height = self.bdf.height
+            self.baseline = self.bdf.baseline
+            self._masks = {}
+
+        def CharacterWidth(self, codepoint):
+            glyph = self.bdf.glyph(codepoint) if self.bdf else None
+            return glyph.device_width if glyph else 0
+
+        def glyph_mask(self, codepoint):
+            """Return (Glyph, boolean bitmap) for a codepoint, cached"""
+            if codepoint not in self._masks:
+                glyph = self.bdf.glyph(codepoint) if self.bdf else None
+                mask = None
+                if glyph is not None:
+                    mask = np.zeros((glyph.height, glyph.width), dtype=bool)
+                    for row_idx, (bits, bit_count) in enumerate(glyph.rows[:glyph.height]):
+                        for col in range(glyph.width):
+                            mask[row_idx, col] = bits >> (bit_count - 1 - col) & 1
+                self._masks[codepoint] = (glyph, mask) if glyph is not None else None
+            return self._masks[codepoint]
+
+    class Color:
+        def __init__(self, red=0, green=0, blue=0):
+            self.red = red
+            self.green = green
+            self.blue = blue
+
+    @staticmethod
+    def DrawText(canvas, font, x, y, color, text):
+        """Draw text with its baseline at y; returns the total advance in pixels"""
+        start_x = x
+        rgb = (color.red, color.green, color.blue)
+        for char in text:
+            entry = font.glyph_mask(ord(char))
+            if entry is None:
+                continue
+            glyph, mask = entry
+
+            top = y - glyph.height - glyph.y_offset
+            x0, y0 = max(0, x), max(0, top)
+            x1 = min(canvas.width, x + glyph.width)
+            y1 = min(canvas.height, top + glyph.height)
+            if x0 < x1 and y0 < y1:
+                region = canvas.pixels[y0:y1, x0:x1]
+                region[mask[y0 - top:y1 - top, x0 - x:x1 - x]] = rgb
+
+            x += glyph.device_width
+        return x - start_x
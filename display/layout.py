@@ -0,0 +1,58 @@
+"""
+Display Layout
+Positions of the text rows and logo for the actual matrix size
+"""
+
+# The layout is designed for a single 64x32 panel
+DESIGN_WIDTH = 64
+DESIGN_HEIGHT = 32
+
+# Text baselines of the artist/show, song/host and info rows in the design
+ROW_BASELINES = (8, 18, 28)
+
+
+class Layout:
+    """
+    Where the text rows and logo go on a width x height matrix
+
+    Chained and parallel panels make a bigger canvas (e.g. three chained
+    64x32 panels in two parallel chains give 192x64). Everything is laid
+    out on a logical canvas of (width / scale) x (height / scale) pixels
+    and scaled up by an integer `scale`, so a wall shows the same design
+    with bigger pixels instead of a small block of text in one corner.
+    Spare logical space (e.g. on a 64x64 panel) centers the design.
+    """
+
+    def __init__(self, width, height, scale=1):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        # Logical canvas that text is laid out on, before scaling
+        self.logical_width = width // scale
+        self.logical_height = height // scale
+
+        top = max(0, (self.logical_height - DESIGN_HEIGHT) // 2)
+        self.baselines = tuple(top + baseline for baseline in ROW_BASELINES)
+        # Top-left of the 64x32 logo design on the logical canvas
+        self.logo_origin = ((self.logical_width - DESIGN_WIDTH) // 2, top)
+
+    @staticmethod
+    def scale_for(width, height):
+        """Largest integer scale at which the 64x32 design still fits"""
+        return max(1, min(width // DESIGN_WIDTH, height // DESIGN_HEIGHT))
+
+    def row_band(self, baseline, font_height, font_baseline):
+        """
+        Logical rows (top, bottom) covered by text drawn at `baseline`
+
+        Clipped to the logical canvas; bottom is exclusive.
+        """
+        top = baseline - font_baseline
+        return max(0, top), min(self.logical_height, top + font_height)
+
+    def __eq__(self, other):
+        return (isinstance(other, Layout) and
+                (self.width, self.height, self.scale) == (other.width, other.height, other.scale))
+
+    def __hash__(self):
+        return hash((self.width, self.height, self.scale))
@@ -3,9 +3,17 @@ Display Renderer
 Handles rendering of KEXP data to RGB LED matrix
 """
 
+import math
 import time
 import logging
+import importlib
+import importlib.util
+from collections import deque
 from display.color_schemes import get_color_scheme_for_show
+from display.bdf import BDFFont
+from display.layout import Layout
+from display.scene import build_scenes, ARTIST, SONG, INFO
+from display.simulation import SimulationSink
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +21,7 @@ try:
     from rgbmatrix import RGBMatrix, RGBMatrixOptions, graphics
     MATRIX_AVAILABLE = True
 except ImportError:
-    logger.warning("RGB Matrix library not available. Running in simulation mode.")
+    logger.warning("RGB Matrix library not available. Falling back to headless or simulation mode.")
     MATRIX_AVAILABLE = False
     # Create dummy graphics class for simulation
     class graphics:
@@ -27,11 +35,80 @@ except ImportError:
         def DrawText(canvas, font, x, y, color, text):
             pass
 
+# The headless framebuffer backend needs NumPy, which is slow to import on a
+# Pi, so it is only imported once the headless backend is actually selected
+HEADLESS_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# KEXP orange/gold background color
+KEXP_LOGO_BG = (255, 186, 58)
+# Dark brown/black for bars and text
+KEXP_LOGO_FG = (59, 43, 27)
+
+# "KEXP" pixel art for the logo
+# Define each letter with higher resolution (7-8 pixels wide x 10 pixels tall)
+KEXP_LOGO_LETTERS = {
+    'K': [
+        [1, 1, 0, 0, 0, 1, 1],
+        [1, 1, 0, 0, 1, 1, 0],
+        [1, 1, 0, 1, 1, 0, 0],
+        [1, 1, 1, 1, 0, 0, 0],
+        [1, 1, 1, 0, 0, 0, 0],
+        [1, 1, 1, 1, 0, 0, 0],
+        [1, 1, 0, 1, 1, 0, 0],
+        [1, 1, 0, 0, 1, 1, 0],
+        [1, 1, 0, 0, 0, 1, 1],
+        [1, 1, 0, 0, 0, 1, 1],
+    ],
+    'E': [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 1, 1, 1, 1, 0],
+        [1, 1, 1, 1, 1, 1, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+    ],
+    'X': [
+        [1, 1, 0, 0, 0, 1, 1],
+        [1, 1, 1, 0, 1, 1, 1],
+        [0, 1, 1, 1, 1, 1, 0],
+        [0, 0, 1, 1, 1, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 1, 1, 1, 0, 0],
+        [0, 1, 1, 1, 1, 1, 0],
+        [1, 1, 1, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0, 1, 1],
+    ],
+    'P': [
+        [1, 1, 1, 1, 1, 1, 0],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 0, 0, 0, 1, 1],
+        [1, 1, 0, 0, 0, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 0],
+    ],
+}
+
 
 class DisplayRenderer:
     """Renders KEXP data to RGB LED matrix display"""
 
-    def __init__(self, config):
+    def __init__(self, config, defer_fonts=False):
         self.config = config
         self.matrix = None
         self.canvas = None
@@ -41,16 +118,67 @@ class DisplayRenderer:
         self.last_play_id = None
         self.airbreak_display_toggle = False  # Toggle between info and logo during airbreak
         self.airbreak_frame_counter = 0  # Counter to switch displays every few seconds
-
-        if MATRIX_AVAILABLE:
+        # Frame-count based timings are defined at 10 FPS and scaled to the target rate
+        frame_scale = config.frame_rate / 10
+        self.scroll_frames = 1.6 * frame_scale  # Frames per 1px scroll step
+        self.airbreak_toggle_frames = int(200 * frame_scale)  # 20 seconds
+        self._logo_cache = None  # ((width, height), pre-rendered logo frame)
+        self.font_metrics = None  # Parsed BDF of the loaded font, for measuring text
+        self.glyph_font = None  # Parsed BDF glyphs for off-screen text strips
+        self._strip_cache = {}  # (segments, rgb) -> RGBA text strip, reset per track
+        self._text_frame = None  # Off-screen logical frame the text strips are composed into
+        self._frame_rows = {}  # baseline -> (x, segments, Color) drawn this frame
+        self._composed_rows = {}  # baseline -> (x, segments, rgb) currently in _text_frame
+        # Composed rows on the back (drawing) and front buffers, None if unknown.
+        # The binding may return a new canvas wrapper on every swap, so the
+        # two buffers are told apart by swap parity rather than identity
+        self._canvas_rows = deque([None, None], maxlen=2)
+        self.layout = None  # Layout for the current matrix size and text scale
+        self._scheme_colors = None  # (ColorScheme, {ARTIST/SONG/INFO: graphics.Color})
+        self.scenes = build_scenes()  # Lines of each display mode, laid out on change
+        self._last_frame_key = None  # Inputs of the frame currently on screen
+        self._scroll_cycle = None  # Scroll loop length in pixels, or None when static
+        self.simulation_sink = None  # Change-aware log output in simulation mode
+        self.fonts_loading = False  # True until load_fonts() finishes when deferred
+
+        self.backend = self._select_backend()
+        self.simulated = self.backend == 'simulation'
+        self.headless = importlib.import_module('display.headless') if self.backend == 'headless' else None
+        self.graphics = self.headless.graphics if self.headless else graphics
+
+        if not self.simulated:
             self._init_matrix()
-            self._load_fonts()
+            if defer_fonts:
+                # Put the logo up now; frames render once load_fonts() has run
+                self.fonts_loading = True
+                self.show_splash()
+            else:
+                self._load_fonts()
         else:
             logger.info("Running in simulation mode - display output will be logged")
 
+    def _select_backend(self):
+        """Pick 'matrix', 'headless' or 'simulation' from config.display_backend"""
+        requested = self.config.display_backend
+
+        if requested in ('auto', 'matrix') and MATRIX_AVAILABLE:
+            return 'matrix'
+        if requested == 'headless':
+            if HEADLESS_AVAILABLE:
+                logger.info("Using headless NumPy framebuffer backend")
+                return 'headless'
+            logger.warning("Headless backend requested but NumPy is not installed")
+        elif requested == 'matrix':
+            logger.warning("Matrix backend requested but the RGB Matrix library is not available")
+
+        return 'simulation'
+
     def _init_matrix(self):
         """Initialize the RGB matrix with configuration"""
-        options = RGBMatrixOptions()
+        if self.backend == 'headless':
+            options = self.headless.RGBMatrixOptions()
+        else:
+            options = RGBMatrixOptions()
         options.rows = self.config.matrix_rows
         options.cols = self.config.matrix_cols
         options.chain_length = self.config.matrix_chain_length
@@ -60,15 +188,28 @@ class DisplayRenderer:
         options.gpio_slowdown = self.config.gpio_slowdown  # Adjust for flickering
         options.disable_hardware_pulsing = True  # Better image quality
 
-        self.matrix = RGBMatrix(options=options)
+        if self.backend == 'headless':
+            self.matrix = self.headless.RGBMatrix(options=options)
+        else:
+            self.matrix = RGBMatrix(options=options)
         # Create canvas once and reuse it
         self.canvas = self.matrix.CreateFrameCanvas()
 
         logger.info(f"Matrix initialized: {options.cols}x{options.rows}")
 
+    def load_fonts(self):
+        """
+        Load fonts deferred by DisplayRenderer(config, defer_fonts=True)
+
+        Safe to call from another thread: frames keep showing the splash
+        until the fonts are in place.
+        """
+        self._load_fonts()
+        self.fonts_loading = False
+
     def _load_fonts(self):
         """Load fonts for matrix display"""
-        if not MATRIX_AVAILABLE:
+        if self.simulated:
             return
 
         logger.info("Attempting to load fonts...")
@@ -82,15 +223,19 @@ class DisplayRenderer:
                 "/home/pi/rpi-rgb-led-matrix/fonts/7x13.bdf",
                 "/home/pi/rpi-rgb-led-matrix/fonts/6x10.bdf",
             ]
+            # An explicitly configured font is tried first
+            if self.config.font_path:
+                font_paths.insert(0, self.config.font_path)
 
             for font_path in font_paths:
                 try:
                     logger.info(f"Trying to load font from: {font_path}")
-                    test_font = graphics.Font()
+                    test_font = self.graphics.Font()
                     test_font.LoadFont(font_path)
                     self.font = test_font
                     logger.info(f"SUCCESS: Loaded font from {font_path}")
                     font_loaded = True
+                    self._load_glyph_font(font_path)
                     break
                 except Exception as font_error:
                     logger.warning(f"Failed to load font {font_path}: {font_error}")
@@ -104,130 +249,252 @@ class DisplayRenderer:
                 for path in font_paths:
                     logger.error(f"  - {path}")
                 logger.error("=" * 60)
-                self.font = graphics.Font()
+                self.font = self.graphics.Font()
         except Exception as e:
             logger.error(f"Fatal error loading fonts: {e}")
-            self.font = graphics.Font()
+            self.font = self.graphics.Font()
 
-    def _draw_kexp_logo(self):
-        """Draw the KEXP logo on the display (32h x 64w)"""
-        if not MATRIX_AVAILABLE:
+    def _load_glyph_font(self, font_path):
+        """Parse the loaded BDF for text measurement and off-screen text strips"""
+        try:
+            # The headless backend has already parsed the same file
+            self.font_metrics = getattr(self.font, 'bdf', None) or BDFFont.load(font_path)
+        except Exception as e:
+            logger.warning(f"Could not parse {font_path}, assuming 6px wide characters: {e}")
+            self.font_metrics = None
+        self._strip_cache.clear()
+
+        if not PIL_AVAILABLE:
+            logger.info("Pillow not available, text will be drawn with DrawText every frame")
+            self.glyph_font = None
+        else:
+            self.glyph_font = self.font_metrics
+
+    def _get_text_strip(self, segments, color):
+        """
+        Return an RGBA strip with each (offset, text) segment rasterized once
+
+        Strips are cached until the track changes, so glyph rasterization
+        cost scales with track changes instead of frames.
+        """
+        rgb = (color.red, color.green, color.blue)
+        key = (segments, rgb)
+        strip = self._strip_cache.get(key)
+        if strip is None:
+            font = self.glyph_font
+            width = max(1, max(offset + font.text_width(text) for offset, text in segments))
+            height = max(1, font.height)
+            mask = bytearray(width * height)
+            for offset, text in segments:
+                font.draw_text(mask, width, offset, text)
+
+            strip = Image.new('RGBA', (width, height), rgb + (0,))
+            strip.putalpha(Image.frombytes('L', (width, height), bytes(mask)))
+            self._strip_cache[key] = strip
+        return strip
+
+    def _draw_segments(self, x, y, color, segments):
+        """Draw (offset, text) segments with their baseline at y, starting at x"""
+        if self.glyph_font is None:
+            for offset, text in segments:
+                self.graphics.DrawText(self.canvas, self.font, x + offset, y, color, text)
             return
 
-        # KEXP orange/gold background color
-        bg_color = graphics.Color(255, 186, 58)
-        # Dark brown/black for bars and text
-        fg_color = graphics.Color(59, 43, 27)
+        # Composed into the off-screen frame after the whole frame is laid out
+        self._frame_rows[y] = (x, segments, color)
+
+    def _get_layout(self):
+        """Return the layout for the matrix size, rebuilding it only if it changed"""
+        width, height = self.matrix.width, self.matrix.height
+        # Only text strips can be scaled up; DrawText always draws 1:1
+        scale = Layout.scale_for(width, height) if self.glyph_font is not None else 1
+        layout = self.layout
+        if layout is None or (layout.width, layout.height, layout.scale) != (width, height, scale):
+            layout = self.layout = Layout(width, height, scale)
+            self._text_frame = None
+            self._composed_rows = {}
+            self._forget_canvas_rows()
+            logger.info(f"Layout: {width}x{height} at {scale}x scale, "
+                        f"text rows at y={', '.join(str(b) for b in layout.baselines)}")
+        return layout
+
+    def _row_bands(self, baselines):
+        """Logical (top, bottom) rows covered by text at each baseline"""
+        font = self.glyph_font
+        return {y: self.layout.row_band(y, font.height, font.baseline) for y in baselines}
+
+    def _compose_text_frame(self):
+        """Redraw only the rows of the off-screen text frame whose content changed"""
+        rows = {
+            y: (x, segments, (color.red, color.green, color.blue))
+            for y, (x, segments, color) in self._frame_rows.items()
+        }
+        bands = self._row_bands(set(rows) | set(self._composed_rows))
+        changed = [y for y in bands if rows.get(y) != self._composed_rows.get(y)]
+        if not changed:
+            return
 
-        # Fill background with KEXP orange
-        for y in range(self.matrix.height):
-            for x in range(self.matrix.width):
-                self.canvas.SetPixel(x, y, bg_color.red, bg_color.green, bg_color.blue)
+        spans = sorted(bands.values())
+        if any(top < prev_bottom for (_, prev_bottom), (top, _) in zip(spans, spans[1:])):
+            # Rows overlap (tall font): clearing one would erase part of another
+            changed = list(bands)
+
+        width = self.layout.logical_width
+        for y in changed:
+            top, bottom = bands[y]
+            if top < bottom:
+                self._text_frame.paste((0, 0, 0), (0, top, width, bottom))
+        for y in changed:
+            if y in self._frame_rows:
+                x, segments, color = self._frame_rows[y]
+                strip = self._get_text_strip(segments, color)
+                # paste() clips anything outside the frame
+                self._text_frame.paste(strip, (x, y - self.glyph_font.baseline), strip)
+        self._composed_rows = rows
+
+    def _push_text_frame(self):
+        """Copy the text frame to the canvas, only the rows that differ from what it shows"""
+        layout = self.layout
+        shown = self._canvas_rows[0]
+        if shown is None:
+            # Unknown contents (first use, logo, clear): replace the whole canvas
+            self.canvas.Clear()
+            spans = [(0, layout.logical_height)]
+        else:
+            bands = self._row_bands(set(shown) | set(self._composed_rows))
+            spans = [band for y, band in bands.items() if shown.get(y) != self._composed_rows.get(y)]
+
+        for top, bottom in spans:
+            if top >= bottom:
+                continue
+            region = self._text_frame.crop((0, top, layout.logical_width, bottom))
+            if layout.scale > 1:
+                region = region.resize((region.width * layout.scale, region.height * layout.scale),
+                                       Image.NEAREST)
+            self.canvas.SetImage(region, 0, top * layout.scale)
+        self._canvas_rows[0] = self._composed_rows
+
+    def _swap(self):
+        """Show the drawn canvas; the old front buffer becomes the one to draw on"""
+        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+        self._canvas_rows.rotate(-1)
+
+    def _forget_canvas_rows(self):
+        """Treat both buffers as unknown so the next push replaces them whole"""
+        self._canvas_rows[0] = self._canvas_rows[1] = None
+
+    def _rasterize_kexp_logo(self, width, height, origin=(0, 0)):
+        """
+        Rasterize the KEXP logo for a width x height display
 
+        The 64x32 logo design is placed with its top-left corner at origin.
+
+        Returns:
+            Tuple of (background rgb, list of (x, y) foreground pixels)
+        """
         # Draw four bars (bar graph visualization)
         # Bar heights (in pixels) - scaled for 32-pixel height display
         bar_heights = [13, 10, 15, 12]
         bar_width = 6
         bar_spacing = 3
-        start_x = 16  # Center the bars (4 bars * 6 wide + 3 spacing * 3 = 33, (64-33)/2 ≈ 16)
-        baseline_y = 16  # Baseline from which bars grow upward (moved up)
+        origin_x, origin_y = origin
+        start_x = origin_x + 16  # Center the bars (4 bars * 6 wide + 3 spacing * 3 = 33, (64-33)/2 ≈ 16)
+        baseline_y = origin_y + 16  # Baseline from which bars grow upward (moved up)
 
-        for i, height in enumerate(bar_heights):
+        pixels = []
+        for i, bar_height in enumerate(bar_heights):
             x = start_x + i * (bar_width + bar_spacing)
-            # Draw each bar UPWARD from baseline (like a bar chart)
+            # Each bar grows UPWARD from baseline (like a bar chart)
             for bx in range(bar_width):
-                for by in range(height):
-                    px = x + bx
-                    py = baseline_y - by  # Draw upward from baseline
-                    if 0 <= px < self.matrix.width and 0 <= py < self.matrix.height:
-                        self.canvas.SetPixel(px, py, fg_color.red, fg_color.green, fg_color.blue)
-
-        # Draw "KEXP" text at the bottom using pixel art
-        # Define each letter with higher resolution (7-8 pixels wide x 10 pixels tall)
-        letters = {
-            'K': [
-                [1, 1, 0, 0, 0, 1, 1],
-                [1, 1, 0, 0, 1, 1, 0],
-                [1, 1, 0, 1, 1, 0, 0],
-                [1, 1, 1, 1, 0, 0, 0],
-                [1, 1, 1, 0, 0, 0, 0],
-                [1, 1, 1, 1, 0, 0, 0],
-                [1, 1, 0, 1, 1, 0, 0],
-                [1, 1, 0, 0, 1, 1, 0],
-                [1, 1, 0, 0, 0, 1, 1],
-                [1, 1, 0, 0, 0, 1, 1],
-            ],
-            'E': [
-                [1, 1, 1, 1, 1, 1, 1],
-                [1, 1, 1, 1, 1, 1, 1],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 1, 1, 1, 1, 0],
-                [1, 1, 1, 1, 1, 1, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 1, 1, 1, 1, 1],
-                [1, 1, 1, 1, 1, 1, 1],
-            ],
-            'X': [
-                [1, 1, 0, 0, 0, 1, 1],
-                [1, 1, 1, 0, 1, 1, 1],
-                [0, 1, 1, 1, 1, 1, 0],
-                [0, 0, 1, 1, 1, 0, 0],
-                [0, 0, 0, 1, 0, 0, 0],
-                [0, 0, 0, 1, 0, 0, 0],
-                [0, 0, 1, 1, 1, 0, 0],
-                [0, 1, 1, 1, 1, 1, 0],
-                [1, 1, 1, 0, 1, 1, 1],
-                [1, 1, 0, 0, 0, 1, 1],
-            ],
-            'P': [
-                [1, 1, 1, 1, 1, 1, 0],
-                [1, 1, 1, 1, 1, 1, 1],
-                [1, 1, 0, 0, 0, 1, 1],
-                [1, 1, 0, 0, 0, 1, 1],
-                [1, 1, 1, 1, 1, 1, 1],
-                [1, 1, 1, 1, 1, 1, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-                [1, 1, 0, 0, 0, 0, 0],
-            ],
-        }
+                for by in range(bar_height):
+                    pixels.append((x + bx, baseline_y - by))
 
         # Draw KEXP aligned with bars at the bottom using single pixels
         text = "KEXP"
         char_spacing = 2
 
-        start_x = 16  # Align with bars (same as bar start_x)
-        start_y = 20  # Position at bottom
+        x_offset = start_x  # Align with bars (same as bar start_x)
+        start_y = origin_y + 20  # Position at bottom
+
+        for char in text:
+            letter_pattern = KEXP_LOGO_LETTERS.get(char)
+            if not letter_pattern:
+                continue
+            for row_idx, row in enumerate(letter_pattern):
+                for col_idx, pixel in enumerate(row):
+                    if pixel:
+                        pixels.append((x_offset + col_idx, start_y + row_idx))
+            x_offset += len(letter_pattern[0]) + char_spacing
+
+        pixels = [(px, py) for px, py in pixels if 0 <= px < width and 0 <= py < height]
+        return KEXP_LOGO_BG, pixels
+
+    def _get_logo_frame(self):
+        """Return the pre-rendered logo, rebuilding it only if the layout changed"""
+        layout = self._get_layout()
+        if self._logo_cache is None or self._logo_cache[0] != layout:
+            size = (layout.logical_width, layout.logical_height)
+            bg, pixels = self._rasterize_kexp_logo(*size, origin=layout.logo_origin)
+            if PIL_AVAILABLE:
+                frame = Image.new('RGB', size, bg)
+                for px, py in pixels:
+                    frame.putpixel((px, py), KEXP_LOGO_FG)
+                if layout.scale > 1 or size != (layout.width, layout.height):
+                    scaled = frame.resize((size[0] * layout.scale, size[1] * layout.scale), Image.NEAREST)
+                    frame = Image.new('RGB', (layout.width, layout.height), bg)
+                    frame.paste(scaled, (0, 0))
+            else:
+                frame = (bg, pixels)
+            self._logo_cache = (layout, frame)
+            logger.info(f"KEXP logo rasterized for {layout.width}x{layout.height}")
+        return self._logo_cache[1]
 
-        for i, char in enumerate(text):
-            if char in letters:
-                letter_pattern = letters[char]
-                char_width = len(letter_pattern[0]) if letter_pattern else 0
-                x_offset = start_x + sum(len(letters[text[j]][0]) + char_spacing for j in range(i))
+    def _draw_kexp_logo(self):
+        """Draw the KEXP logo on the display (32h x 64w)"""
+        if self.simulated:
+            return
 
-                for row_idx, row in enumerate(letter_pattern):
-                    for col_idx, pixel in enumerate(row):
-                        if pixel:
-                            px = x_offset + col_idx
-                            py = start_y + row_idx
-                            if 0 <= px < self.matrix.width and 0 <= py < self.matrix.height:
-                                self.canvas.SetPixel(px, py, fg_color.red, fg_color.green, fg_color.blue)
+        frame = self._get_logo_frame()
+        if PIL_AVAILABLE:
+            # One bulk copy of the cached frame
+            self.canvas.SetImage(frame, 0, 0)
+        else:
+            # Without Pillow: bulk fill the background, then only the cached foreground pixels
+            bg, pixels = frame
+            self.canvas.Fill(*bg)
+            r, g, b = KEXP_LOGO_FG
+            for px, py in pixels:
+                self.canvas.SetPixel(px, py, r, g, b)
+        # The text frame no longer matches anything on this canvas
+        self._canvas_rows[0] = None
+
+    def show_splash(self):
+        """Show the KEXP logo until the first frame is rendered"""
+        if self.simulated:
+            return
+        self._last_frame_key = None
+        self._draw_kexp_logo()
+        self._swap()
 
-    def render_now_playing(self, play_data):
+    def render_now_playing(self, play_data, frames=1):
         """
         Render the currently playing track information
 
         Args:
             play_data: Dictionary containing artist, song, show info
+            frames: Frame slots this frame stands for; more than 1 after the
+                frame scheduler dropped frames, so scrolling and the airbreak
+                toggle keep their speed under load
         """
-        if not MATRIX_AVAILABLE:
+        if not play_data:
+            return
+
+        if self.simulated:
             self._simulate_display(play_data)
             return
 
-        if not play_data:
+        if self.fonts_loading:
+            # The splash stays up until load_fonts() finishes
             return
 
         try:
@@ -235,12 +502,10 @@ class DisplayRenderer:
             play_id = f"{play_data.get('artist', '')}:{play_data.get('song', '')}"
             if play_id != self.last_play_id:
                 self.last_play_id = play_id
-                self.current_scroll_pos = self.matrix.width
+                self._strip_cache.clear()
+                self.current_scroll_pos = self._get_layout().logical_width
                 self.scroll_counter = 0
 
-            # Clear the canvas for this frame (reuse existing canvas)
-            self.canvas.Clear()
-
             # Ensure font is loaded
             if not self.font:
                 logger.warning("Font not loaded, attempting to reload")
@@ -259,195 +524,126 @@ class DisplayRenderer:
                 from display.color_schemes import COLOR_SCHEMES
                 color_scheme = COLOR_SCHEMES['indie_rock']
 
-            # Define colors from scheme
-            artist_color = graphics.Color(*color_scheme.artist)
-            song_color = graphics.Color(*color_scheme.song)
-            info_color = graphics.Color(*color_scheme.info)
-
             # Check if this is an airbreak
             play_type = play_data.get('play_type', '')
             is_airbreak = play_type == 'airbreak'
 
             if is_airbreak:
                 # Alternate between info display and KEXP logo every 20 seconds (200 frames at 10fps)
-                self.airbreak_frame_counter += 1
-                if self.airbreak_frame_counter >= 200:
+                self.airbreak_frame_counter += frames
+                if self.airbreak_frame_counter >= self.airbreak_toggle_frames:
                     self.airbreak_display_toggle = not self.airbreak_display_toggle
                     self.airbreak_frame_counter = 0
 
-                # If showing logo, draw it and skip the rest
-                if self.airbreak_display_toggle:
-                    self._draw_kexp_logo()
-                else:
-                    # Show program/DJ info during airbreaks
-                    display_show_name = str(play_data.get('show_name', 'KEXP'))
-                    host_name = str(play_data.get('host_name', ''))
-
-                    # Calculate widths
-                    show_width = len(display_show_name) * 6
-                    host_width = len(host_name) * 6 if host_name else 0
-
-                    # Check if any text needs scrolling
-                    needs_scrolling = (show_width > self.matrix.width or
-                                     host_width > self.matrix.width)
-
-                    # Draw show name (top line)
-                    if show_width > self.matrix.width:
-                        # Continuous scrolling with separator
-                        separator = "  |  "
-                        separator_width = len(separator) * 6
-                        x_pos = self.current_scroll_pos
-                        graphics.DrawText(self.canvas, self.font, x_pos, 8, artist_color, display_show_name)
-                        # Draw separator and text again for continuous loop
-                        graphics.DrawText(self.canvas, self.font, x_pos + show_width, 8, artist_color, separator)
-                        graphics.DrawText(self.canvas, self.font, x_pos + show_width + separator_width, 8, artist_color, display_show_name)
-                    else:
-                        x_pos = max(0, (self.matrix.width - show_width) // 2)
-                        graphics.DrawText(self.canvas, self.font, x_pos, 8, artist_color, display_show_name)
-
-                    # Draw host name (middle line) if available
-                    if host_name:
-                        host_width = len(host_name) * 6
-                        if host_width > self.matrix.width:
-                            # Continuous scrolling with separator (using same scroll position as show name)
-                            separator = "  |  "
-                            separator_width = len(separator) * 6
-                            x_pos = self.current_scroll_pos
-                            graphics.DrawText(self.canvas, self.font, x_pos, 18, song_color, host_name)
-                            # Draw separator and text again for continuous loop
-                            graphics.DrawText(self.canvas, self.font, x_pos + host_width, 18, song_color, separator)
-                            graphics.DrawText(self.canvas, self.font, x_pos + host_width + separator_width, 18, song_color, host_name)
-                        else:
-                            # Center if it fits
-                            x_pos = max(0, (self.matrix.width - host_width) // 2)
-                            graphics.DrawText(self.canvas, self.font, x_pos, 18, song_color, host_name)
-                    else:
-                        # Center "Now Playing..." message
-                        now_playing_text = "Now Playing..."
-                        now_playing_width = len(now_playing_text) * 6
-                        x_pos = max(0, (self.matrix.width - now_playing_width) // 2)
-                        graphics.DrawText(self.canvas, self.font, x_pos, 18, song_color, now_playing_text)
-
-                    # Show station ID at bottom (centered)
-                    station_id = "90.3 FM"
-                    station_width = len(station_id) * 6
-                    station_x = max(0, (self.matrix.width - station_width) // 2)
-                    graphics.DrawText(self.canvas, self.font, station_x, 28, info_color, station_id)
-
-                    # Update scroll position if anything needs scrolling
-                    if needs_scrolling:
-                        # Scroll at moderate speed - advance every 1.6 frames (25% faster than every 2 frames)
-                        self.scroll_counter += 1
-                        if self.scroll_counter >= 1.6:
-                            self.current_scroll_pos -= 1
-                            self.scroll_counter = 0
-                        # Reset for continuous scrolling - add back the cycle length for seamless loop
-                        separator = "  |  "
-                        separator_width = len(separator) * 6
-                        max_width = max(show_width, host_width)
-                        # When scrolled past one full cycle, add back to create seamless loop
-                        if self.current_scroll_pos < -(max_width + separator_width):
-                            self.current_scroll_pos += (max_width + separator_width)
-            else:
-                # Normal track display
-                artist = str(play_data.get('artist', 'Unknown'))
-                song = str(play_data.get('song', 'Unknown'))
-                show_name_display = str(play_data.get('show_name', 'KEXP 90.3'))
-
-                # Calculate text width for scrolling
-                artist_width = len(artist) * 6
-                song_width = len(song) * 6
-                show_width = len(show_name_display) * 6
-
-                # Determine if we need to scroll (any line is too long)
-                needs_scrolling = (artist_width > self.matrix.width or 
-                                 song_width > self.matrix.width or 
-                                 show_width > self.matrix.width)
-
-                # Position for artist (top line, y=8)
-                if artist_width > self.matrix.width:
-                    # Continuous scrolling with separator
-                    separator = "  |  "
-                    separator_width = len(separator) * 6
-                    x_pos = self.current_scroll_pos
-                    graphics.DrawText(self.canvas, self.font, x_pos, 8, artist_color, artist)
-                    # Draw separator and text again for continuous loop
-                    graphics.DrawText(self.canvas, self.font, x_pos + artist_width, 8, artist_color, separator)
-                    graphics.DrawText(self.canvas, self.font, x_pos + artist_width + separator_width, 8, artist_color, artist)
-                else:
-                    # Center the artist name if it fits
-                    x_pos = max(0, (self.matrix.width - artist_width) // 2)
-                    graphics.DrawText(self.canvas, self.font, x_pos, 8, artist_color, artist)
-
-                # Position for song (middle line, y=18)
-                if song_width > self.matrix.width:
-                    # Continuous scrolling with separator
-                    separator = "  |  "
-                    separator_width = len(separator) * 6
-                    x_pos = self.current_scroll_pos
-                    graphics.DrawText(self.canvas, self.font, x_pos, 18, song_color, song)
-                    # Draw separator and text again for continuous loop
-                    graphics.DrawText(self.canvas, self.font, x_pos + song_width, 18, song_color, separator)
-                    graphics.DrawText(self.canvas, self.font, x_pos + song_width + separator_width, 18, song_color, song)
-                else:
-                    x_pos = max(0, (self.matrix.width - song_width) // 2)
-                    graphics.DrawText(self.canvas, self.font, x_pos, 18, song_color, song)
-
-                # Position for show name (bottom line, y=28) - CHANGED FROM ALBUM
-                if show_width > self.matrix.width:
-                    # Continuous scrolling with separator
-                    separator = "  |  "
-                    separator_width = len(separator) * 6
-                    x_pos = self.current_scroll_pos
-                    graphics.DrawText(self.canvas, self.font, x_pos, 28, info_color, show_name_display)
-                    # Draw separator and text again for continuous loop
-                    graphics.DrawText(self.canvas, self.font, x_pos + show_width, 28, info_color, separator)
-                    graphics.DrawText(self.canvas, self.font, x_pos + show_width + separator_width, 28, info_color, show_name_display)
-                else:
-                    # Center the show name if it fits
-                    x_pos = max(0, (self.matrix.width - show_width) // 2)
-                    graphics.DrawText(self.canvas, self.font, x_pos, 28, info_color, show_name_display)
-
-                # Update scroll position if anything needs scrolling
-                if needs_scrolling:
-                    # Scroll at moderate speed - advance every 1.6 frames (25% faster than every 2 frames)
-                    self.scroll_counter += 1
-                    if self.scroll_counter >= 1.6:
-                        self.current_scroll_pos -= 1
-                        self.scroll_counter = 0
-                    # Reset for continuous scrolling - add back the cycle length for seamless loop
-                    separator = "  |  "
-                    separator_width = len(separator) * 6
-                    max_width = max(artist_width, song_width, show_width)
-                    # When scrolled past one full cycle, add back to create seamless loop
-                    if self.current_scroll_pos < -(max_width + separator_width):
-                        self.current_scroll_pos += (max_width + separator_width)
+            # Skip the whole draw/swap path if nothing visible changed since the
+            # last frame; the front buffer already shows it
+            frame_key = (
+                play_type,
+                play_data.get('artist'),
+                play_data.get('song'),
+                show_name,
+                play_data.get('host_name'),
+                color_scheme,
+                is_airbreak and self.airbreak_display_toggle,
+                self.current_scroll_pos,
+            )
+            if frame_key == self._last_frame_key:
+                self._advance_scroll(frames)
+                return
+            self._last_frame_key = frame_key
+
+            # Text is laid out on the logical canvas, scaled up on big walls
+            layout = self._get_layout()
+
+            self._frame_rows = {}
+            if self.glyph_font is None:
+                # DrawText draws straight onto the canvas, so start from a clear one
+                self.canvas.Clear()
+                self._canvas_rows[0] = None
+            elif self._text_frame is None:
+                self._text_frame = Image.new('RGB', (layout.logical_width, layout.logical_height))
+
+            # Define colors from scheme (created once per scheme)
+            if self._scheme_colors is None or self._scheme_colors[0] is not color_scheme:
+                self._scheme_colors = (color_scheme, {
+                    ARTIST: self.graphics.Color(*color_scheme.artist),
+                    SONG: self.graphics.Color(*color_scheme.song),
+                    INFO: self.graphics.Color(*color_scheme.info),
+                })
+            colors = self._scheme_colors[1]
+
+            scene = self._update_scene(play_data, is_airbreak, layout.logical_width)
+            if scene.logo:
+                self._draw_kexp_logo()
+            for line in scene.lines:
+                self._draw_segments(line.position(self.current_scroll_pos), layout.baselines[line.row],
+                                    colors[line.color], line.segments)
+
+            # Remember the loop length so scrolling can advance after this frame
+            self._scroll_cycle = scene.scroll_cycle
+
+            # Copy only the text rows that changed to the canvas
+            if self.glyph_font is not None and not scene.logo:
+                self._compose_text_frame()
+                self._push_text_frame()
 
             # Swap buffer - this is atomic and thread-safe
-            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            self._swap()
+
+            self._advance_scroll(frames)
 
         except Exception as e:
             logger.error(f"Error rendering display: {e}", exc_info=True)
 
+    def _update_scene(self, play_data, is_airbreak, width):
+        """Pick the scene for this frame and set the text of its lines"""
+        if is_airbreak:
+            # Alternate between show/host info and the KEXP logo
+            if self.airbreak_display_toggle:
+                return self.scenes['logo']
+            host_name = str(play_data.get('host_name', ''))
+            scene = self.scenes['airbreak' if host_name else 'airbreak_no_host']
+            texts = (str(play_data.get('show_name', 'KEXP')), host_name)
+        else:
+            scene = self.scenes['track']
+            texts = (
+                str(play_data.get('artist', 'Unknown')),
+                str(play_data.get('song', 'Unknown')),
+                str(play_data.get('show_name', 'KEXP 90.3')),
+            )
+        scene.update(texts, self.font_metrics, width)
+        return scene
+
+    def _advance_scroll(self, frames=1):
+        """Advance the scroll position after `frames` frame slots if any line is scrolling"""
+        if self._scroll_cycle is None:
+            return
+
+        # Scroll at moderate speed - one 1px step each time the counter reaches
+        # scroll_frames (1.6 at 10 FPS), then the counter starts over
+        steps_every = max(1, math.ceil(self.scroll_frames))
+        steps, self.scroll_counter = divmod(self.scroll_counter + frames, steps_every)
+        self.current_scroll_pos -= steps
+        # When scrolled past one full cycle, add back the cycle length for a seamless loop
+        while self.current_scroll_pos < -self._scroll_cycle:
+            self.current_scroll_pos += self._scroll_cycle
+
     def _simulate_display(self, play_data):
         """Simulate display output when matrix is not available"""
-        logger.info("=" * 60)
-        logger.info(f"NOW PLAYING:")
-        logger.info(f"  Artist: {play_data.get('artist', 'Unknown')}")
-        logger.info(f"  Song:   {play_data.get('song', 'Unknown')}")
-        logger.info(f"  Show:   {play_data.get('show_name', 'KEXP')}")
-        if play_data.get('comment'):
-            logger.info(f"  Note:   {play_data.get('comment')}")
-        logger.info("=" * 60)
+        if self.simulation_sink is None:
+            self.simulation_sink = SimulationSink(self.config.simulation_heartbeat)
+        self.simulation_sink.frame(play_data)
 
     def clear(self):
         """Clear the display"""
-        if MATRIX_AVAILABLE and self.canvas:
+        if not self.simulated and self.canvas:
+            self._last_frame_key = None
+            self._forget_canvas_rows()
             self.canvas.Clear()
-            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            self._swap()
 
     def cleanup(self):
         """Clean up resources"""
-        if MATRIX_AVAILABLE and self.matrix:
+        if not self.simulated and self.matrix:
             self.clear()
             logger.info("Display cleaned up")
@@ -0,0 +1,125 @@
+"""
+Display Scenes
+The lines shown in each display mode, laid out once and reused every frame
+"""
+
+# Drawn between the end of a scrolling line and its next repeat
+SEPARATOR = "  |  "
+
+STATION_ID = "90.3 FM"
+
+# Colors of a ColorScheme a line can be drawn in
+ARTIST = 'artist'
+SONG = 'song'
+INFO = 'info'
+
+
+def text_width(font, text):
+    """Width in pixels of text in a parsed BDFFont (6px per character without one)"""
+    if font is not None:
+        return font.text_width(text)
+    # No parsed font: assume the default 6x9 font
+    return len(text) * 6
+
+
+class TextLine:
+    """
+    One row of text: centered if it fits, otherwise scrolling in a loop
+
+    The layout (width, position, the segments to draw) is recomputed only
+    when the text, font or available width changes. Lines with fixed
+    `text` (labels like the station ID) never scroll; they are centered
+    and clipped instead.
+    """
+
+    def __init__(self, row, color, text=None):
+        self.row = row  # index into Layout.baselines
+        self.color = color  # ARTIST, SONG or INFO
+        self.fixed_text = text
+        self.scrollable = text is None
+
+        self._key = None
+        self.text = ''
+        self.width = 0
+        self.scrolls = False
+        self.x = 0  # left edge when centered
+        self.cycle = 0  # scroll loop length in pixels when scrolling
+        self.segments = ()  # (offset, text) pieces, drawn from the line's x
+
+    def update(self, text, font, available_width):
+        """Set the line's text, re-laying it out only if an input changed (returns True)"""
+        key = (text, id(font), available_width)
+        if key == self._key:
+            return False
+        self._key = key
+
+        self.text = text
+        self.width = text_width(font, text)
+        self.scrolls = self.scrollable and self.width > available_width
+        if self.scrolls:
+            # Text, separator and text again so the loop is seamless
+            separator_width = text_width(font, SEPARATOR)
+            self.segments = ((0, text), (self.width, SEPARATOR),
+                             (self.width + separator_width, text))
+            self.cycle = self.width + separator_width
+        else:
+            self.segments = ((0, text),)
+            self.cycle = 0
+            self.x = max(0, (available_width - self.width) // 2)
+        return True
+
+    def position(self, scroll_pos):
+        """Left edge of the line for the shared scroll position"""
+        return scroll_pos if self.scrolls else self.x
+
+
+class Scene:
+    """
+    The elements of one display mode: text lines and/or the KEXP logo
+
+    All scrolling lines share one scroll position, and loop after the
+    longest of them.
+    """
+
+    def __init__(self, name, lines=(), logo=False):
+        self.name = name
+        self.lines = list(lines)
+        self.logo = logo
+        self.scroll_cycle = None  # Scroll loop length in pixels, or None if nothing scrolls
+
+    def update(self, texts, font, available_width):
+        """Set the text of each line without fixed text, in line order"""
+        texts = iter(texts)
+        changed = False
+        for line in self.lines:
+            text = line.fixed_text if line.fixed_text is not None else next(texts, '')
+            changed = line.update(text, font, available_width) or changed
+
+        if changed:
+            cycles = [line.cycle for line in self.lines if line.scrolls]
+            self.scroll_cycle = max(cycles) if cycles else None
+
+
+def build_scenes():
+    """The scenes the renderer switches between, keyed by name"""
+    return {
+        # Artist, song and show name
+        'track': Scene('track', [
+            TextLine(0, ARTIST),
+            TextLine(1, SONG),
+            TextLine(2, INFO),
+        ]),
+        # Show name, host and station ID during air breaks
+        'airbreak': Scene('airbreak', [
+            TextLine(0, ARTIST),
+            TextLine(1, SONG),
+            TextLine(2, INFO, text=STATION_ID),
+        ]),
+        # Air break of a show without a host
+        'airbreak_no_host': Scene('airbreak_no_host', [
+            TextLine(0, ARTIST),
+            TextLine(1, SONG, text="Now Playing..."),
+            TextLine(2, INFO, text=STATION_ID),
+        ]),
+        'logo': Scene('logo', logo=True),
+    }
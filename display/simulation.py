@@ -0,0 +1,72 @@
+"""
+Simulation Output
+Change-aware log sink used in place of the matrix when no display is available
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationSink:
+    """
+    Logs what the display would show, but only when it changes
+
+    The renderer hands every frame to the sink. A play is logged once when
+    it first appears; identical frames after that are only counted. If
+    `heartbeat_interval` is set, a one-line summary with frame stats is
+    logged at that rate so a quiet log still shows the loop is alive.
+    """
+
+    def __init__(self, heartbeat_interval=0, clock=time.monotonic):
+        self.heartbeat_interval = heartbeat_interval
+        self._clock = clock
+        self._last_key = None
+        self._last_play = None
+        self._frames = 0
+        self._heartbeat_start = clock()
+
+    def frame(self, play_data):
+        """Record one rendered frame, logging only on changes and heartbeats"""
+        self._frames += 1
+
+        key = (
+            play_data.get('artist'),
+            play_data.get('song'),
+            play_data.get('show_name'),
+            play_data.get('comment'),
+            play_data.get('play_type'),
+        )
+        if key != self._last_key:
+            self._last_key = key
+            self._last_play = play_data
+            self._log_play(play_data)
+
+        if self.heartbeat_interval:
+            now = self._clock()
+            elapsed = now - self._heartbeat_start
+            if elapsed >= self.heartbeat_interval:
+                self._log_heartbeat(elapsed)
+                self._heartbeat_start = now
+                self._frames = 0
+
+    def _log_play(self, play_data):
+        """Log the full now playing block"""
+        logger.info("=" * 60)
+        logger.info(f"NOW PLAYING:")
+        logger.info(f"  Artist: {play_data.get('artist', 'Unknown')}")
+        logger.info(f"  Song:   {play_data.get('song', 'Unknown')}")
+        logger.info(f"  Show:   {play_data.get('show_name', 'KEXP')}")
+        if play_data.get('comment'):
+            logger.info(f"  Note:   {play_data.get('comment')}")
+        logger.info("=" * 60)
+
+    def _log_heartbeat(self, elapsed):
+        """Log a one-line frame rate summary and the play on screen"""
+        play = self._last_play or {}
+        logger.info(
+            f"Simulation heartbeat: {self._frames} frames in {elapsed:.0f}s "
+            f"({self._frames / elapsed:.1f} fps) - showing "
+            f"{play.get('artist', 'Unknown')} - {play.get('song', 'Unknown')}"
+        )
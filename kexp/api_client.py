@@ -3,108 +3,507 @@ KEXP API Client
 Fetches current show and now playing data from KEXP API
 """
 
+import time
 import requests
 import logging
+from datetime import datetime
+from kexp.show_cache import ShowDetailsCache, parse_api_time
+from kexp.resilience import EndpointGuard, CircuitOpenError, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
+# Outcomes of KEXPClient.poll_current_play() and sync_new_plays()
+PLAY_CHANGED = 'changed'
+PLAY_UNCHANGED = 'unchanged'
+PLAY_ERROR = 'error'
 
-class KEXPClient:
-    """Client for interacting with KEXP API"""
+
+def play_key(play):
+    """Stable identity of a raw play from the API: its id, else its airdate"""
+    return play.get('id') or play.get('airdate') or None
+
+
+def mark_stale(value):
+    """Copy of a last-known-good dict flagged as stale, or None"""
+    if not value:
+        return None
+    stale = dict(value)
+    stale['stale'] = True
+    return stale
+
+
+def _format_airdate(value):
+    """Format a datetime (or pass through a string) for airdate filters"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class BaseKEXPClient:
+    """
+    State and response handling shared by KEXPClient and AsyncKEXPClient
+
+    Subclasses only do the I/O: they send the request and hand the decoded
+    response to these helpers, so play identity, parsing, the show cache,
+    stale fallbacks, history recording and backoff behave the same in both.
+    """
 
     BASE_URL = "https://api.kexp.org/v2"
 
-    def __init__(self):
+    # Query for the newest play
+    CURRENT_PLAY_PARAMS = {
+        'limit': 1,
+        'ordering': '-airdate'
+    }
+
+    # The local history only answers get_recent_plays() while its newest
+    # play is within this many seconds of the newest play synced
+    HISTORY_MAX_LAG = 60
+
+    def __init__(self, show_cache_size=32, history=None, base_url=None):
+        # Another API root, e.g. a local mock server (see scripts/mock_kexp_api.py)
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        # Show details only change when the show does, so keep them until end_time
+        self.show_cache = ShowDetailsCache(max_entries=show_cache_size)
+        # Identity and validators of the last play returned by poll_current_play()
+        self._current_play = None
+        self._current_play_key = None
+        self._plays_etag = None
+        self._plays_last_modified = None
+        # Last good recent plays, served stale while the API is failing
+        self._recent_plays = []
+        # Optional local PlayHistory: every play and show seen is recorded,
+        # and get_recent_plays() is served from it while it is complete
+        self.history = history
+        # Backoff and circuit breaker per endpoint
+        self.guards = {
+            'plays': EndpointGuard('plays'),
+            'shows': EndpointGuard('shows'),
+        }
+
+    @property
+    def current_play(self):
+        """The newest play returned by poll_current_play() or sync_new_plays()"""
+        return self._current_play
+
+    def _guard(self, endpoint):
+        """The endpoint's guard; raises CircuitOpenError while it is backing off"""
+        guard = self.guards[endpoint]
+        if not guard.allow():
+            raise CircuitOpenError(f"{endpoint} endpoint backing off ({guard.state})")
+        return guard
+
+    @staticmethod
+    def _record_response(guard, status, response):
+        """Count 429 and 5xx responses as failures; anything else resets the backoff"""
+        if status == 429 or status >= 500:
+            guard.record_failure(retry_after_seconds(response))
+        else:
+            guard.record_success()
+
+    def _current_play_headers(self):
+        """Conditional request headers from the last current play response"""
+        headers = {}
+        if self._plays_etag:
+            headers['If-None-Match'] = self._plays_etag
+        if self._plays_last_modified:
+            headers['If-Modified-Since'] = self._plays_last_modified
+        return headers
+
+    def _current_play_response(self, status, headers, data):
+        """
+        Turn a current play response into poll_current_play()'s result
+
+        An unchanged play (304, or the same stable identity) is returned
+        without being parsed again.
+        """
+        if status == 304:
+            return PLAY_UNCHANGED, self._current_play
+
+        self._plays_etag = headers.get('ETag')
+        self._plays_last_modified = headers.get('Last-Modified')
+
+        if data and 'results' in data and len(data['results']) > 0:
+            play = data['results'][0]
+
+            key = play_key(play)
+            if key is not None and key == self._current_play_key:
+                return PLAY_UNCHANGED, self._current_play
+
+            self._current_play_key = key
+            self._current_play = self._parse_play(play)
+            self._record_plays([play])
+            return PLAY_CHANGED, self._current_play
+
+        return PLAY_UNCHANGED, None
+
+    def _current_play_failed(self, error):
+        """poll_current_play()'s result when the request failed"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"Skipping current play fetch: {error}")
+        else:
+            logger.error(f"Error fetching current play: {error!r}")
+        return PLAY_ERROR, mark_stale(self._current_play)
+
+    def _show_response(self, show_id, show):
+        """Parse, cache and record show details from the API"""
+        details = self._parse_show(show)
+        self.show_cache.put(show_id, details)
+        if self.history is not None:
+            try:
+                self.history.record_show(show_id, details)
+            except Exception as e:
+                logger.error(f"Error recording show history: {e}")
+        return details
+
+    def _show_failed(self, show_id, error):
+        """The last good show details, marked stale, when the request failed"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"Skipping show details fetch: {error}")
+        else:
+            logger.error(f"Error fetching show details: {error!r}")
+        return mark_stale(self.show_cache.peek(show_id))
+
+    def _history_complete_window(self):
+        """
+        (since, until) airdates between which the history holds every play,
+        or None if that is not known
+
+        Polling only records the plays seen at poll time, so by default the
+        history is never known to be complete.
+        """
+        return None
+
+    def _local_recent_plays(self, limit):
+        """
+        Recent plays from the local history, or None if it can't answer
+
+        The history answers only if the `limit` newest plays all fall in
+        the window it is known to be complete for, and its newest play is
+        the one just synced, so plays from before a restart or outage are
+        never served as recent.
+        """
+        window = self._history_complete_window() if self.history is not None else None
+        if window is None:
+            return None
+        since, until = (parse_api_time(airdate) for airdate in window)
+        if since is None or until is None:
+            return None
+
+        try:
+            plays = self.history.recent_plays(limit)
+        except Exception as e:
+            logger.error(f"Error reading play history: {e}")
+            return None
+        if len(plays) < limit:
+            return None
+
+        newest = parse_api_time(plays[0].get('airdate'))
+        oldest = parse_api_time(plays[-1].get('airdate'))
+        if newest is None or oldest is None or oldest < since:
+            return None
+        if abs(until - newest) > self.HISTORY_MAX_LAG:
+            return None
+        return plays
+
+    def _recent_plays_response(self, data):
+        """Remember and record a recent plays response"""
+        if data and 'results' in data:
+            self._recent_plays = data['results']
+            self._record_plays(data['results'])
+            return data['results']
+        return []
+
+    def _recent_plays_failed(self, limit, error):
+        """The last good recent plays, marked stale, when the request failed"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"Skipping recent plays fetch: {error}")
+        else:
+            logger.error(f"Error fetching recent plays: {error!r}")
+        return [mark_stale(play) for play in self._recent_plays[:limit]]
+
+    @staticmethod
+    def _parse_play(play):
+        """Extract and format the play data used by the display"""
+        return {
+            'play_id': play_key(play),
+            'artist': play.get('artist', 'Unknown Artist'),
+            'song': play.get('song', 'Unknown Track'),
+            'album': play.get('album', ''),
+            'airdate': play.get('airdate', ''),
+            'show': play.get('show'),
+            'show_uri': play.get('show_uri', ''),
+            'comment': play.get('comment', ''),
+            'play_type': play.get('play_type', ''),
+            'is_local': play.get('is_local', False),
+            'thumbnail_uri': play.get('thumbnail_uri', '')
+        }
+
+    @staticmethod
+    def _parse_show(show):
+        """Extract the show details used by the display"""
+        return {
+            'program_name': show.get('program_name', 'KEXP'),
+            'program_tags': show.get('program_tags', ''),
+            'host_names': show.get('host_names', ''),
+            'start_time': show.get('start_time', ''),
+            'end_time': show.get('end_time', '')
+        }
+
+    def _record_plays(self, plays):
+        """Write raw plays to the local history, if one is attached"""
+        if self.history is None:
+            return
+        try:
+            self.history.record_plays(plays)
+        except Exception as e:
+            logger.error(f"Error recording play history: {e}")
+
+
+class KEXPClient(BaseKEXPClient):
+    """Client for interacting with KEXP API"""
+
+    def __init__(self, show_cache_size=32, history=None, base_url=None):
+        super().__init__(show_cache_size, history, base_url)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'KEXP-Display/1.0'
         })
+        # High-water mark for sync_new_plays(): newest airdate seen and the
+        # play keys at that airdate (the airdate filter may be inclusive)
+        self._high_water_airdate = None
+        self._high_water_keys = set()
+        # Airdate from which every play has been synced (and recorded)
+        self._synced_since = None
+
+    def _get(self, endpoint, url, params=None, headers=None):
+        """
+        GET through the endpoint's backoff/circuit breaker
+
+        Raises CircuitOpenError without touching the network while the
+        endpoint is backing off. Connection errors, timeouts, 429 and 5xx
+        responses count as failures; other responses reset the backoff.
+        """
+        guard = self._guard(endpoint)
+
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
+        except requests.exceptions.RequestException:
+            guard.record_failure()
+            raise
+
+        self._record_response(guard, response.status_code, response)
+        response.raise_for_status()
+        return response
 
     def get_current_play(self):
         """
         Get the currently playing track from KEXP
         Returns the most recent play from the plays endpoint
+        (the last good play marked stale if the API is failing)
+        """
+        status, play = self.poll_current_play()
+        return play
+
+    def poll_current_play(self):
+        """
+        Check whether the current play has changed since the last poll
+
+        Sends If-None-Match / If-Modified-Since when the API gave us
+        validators, and compares the play's stable identity (id or airdate)
+        before building the play dict, so an unchanged play costs no parsing
+        or downstream work.
+
+        Returns:
+            Tuple of (status, play) where status is PLAY_CHANGED,
+            PLAY_UNCHANGED or PLAY_ERROR. play is the current play dict,
+            or None if nothing is playing. On error it is the last good
+            play marked 'stale': True (or None if there is none yet).
         """
         try:
-            url = f"{self.BASE_URL}/plays/"
+            url = f"{self.base_url}/plays/"
+            response = self._get('plays', url, params=self.CURRENT_PLAY_PARAMS,
+                                 headers=self._current_play_headers())
+            data = response.json() if response.status_code != 304 else None
+            return self._current_play_response(response.status_code, response.headers, data)
+
+        except (CircuitOpenError, requests.exceptions.RequestException, ValueError) as e:
+            return self._current_play_failed(e)
+
+    def sync_new_plays(self, max_plays=50):
+        """
+        Fetch only the plays that aired since the last sync, in one request
+
+        The first call just establishes the high-water mark from the latest
+        play. After that, each call asks for plays with airdate after the
+        mark, so short tracks and airbreaks that start and end between polls
+        are not lost and already-seen plays are not downloaded again. If
+        more than `max_plays` aired since the last sync (e.g. after an
+        outage), the newest ones are kept and the gap is logged.
+
+        Returns:
+            Tuple of (status, plays) where status is PLAY_CHANGED,
+            PLAY_UNCHANGED or PLAY_ERROR and plays is a list of new play
+            dicts, oldest first (empty unless changed).
+        """
+        try:
+            url = f"{self.base_url}/plays/"
             params = {
-                'limit': 1,
+                'limit': max_plays if self._high_water_airdate else 1,
                 'ordering': '-airdate'
             }
+            if self._high_water_airdate:
+                params['airdate_after'] = self._high_water_airdate
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
+            response = self._get('plays', url, params=params)
             data = response.json()
+            results = (data or {}).get('results') or []
 
-            if data and 'results' in data and len(data['results']) > 0:
-                play = data['results'][0]
-
-                # Extract and format the play data
-                return {
-                    'artist': play.get('artist', 'Unknown Artist'),
-                    'song': play.get('song', 'Unknown Track'),
-                    'album': play.get('album', ''),
-                    'airdate': play.get('airdate', ''),
-                    'show': play.get('show'),
-                    'show_uri': play.get('show_uri', ''),
-                    'comment': play.get('comment', ''),
-                    'play_type': play.get('play_type', ''),
-                    'is_local': play.get('is_local', False),
-                    'thumbnail_uri': play.get('thumbnail_uri', '')
-                }
+            gap = self._high_water_airdate is None or len(results) >= max_plays
+            if self._high_water_airdate and gap:
+                logger.warning(f"More than {max_plays} plays since {self._high_water_airdate}, "
+                               f"older ones were skipped")
 
-            return None
+            # Oldest first, without plays already seen at the high-water mark
+            new_plays = [
+                play for play in reversed(results)
+                if not (play.get('airdate') == self._high_water_airdate
+                        and play_key(play) in self._high_water_keys)
+            ]
+            if not new_plays:
+                return PLAY_UNCHANGED, []
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching current play: {e}")
-            return None
+            if gap:
+                # Plays before this batch may be missing from the history
+                self._synced_since = new_plays[0].get('airdate')
+            newest_airdate = new_plays[-1].get('airdate')
+            if newest_airdate != self._high_water_airdate:
+                self._high_water_airdate = newest_airdate
+                self._high_water_keys = set()
+            self._high_water_keys.update(
+                play_key(play) for play in new_plays if play.get('airdate') == newest_airdate
+            )
+
+            self._record_plays(new_plays)
+            parsed = [self._parse_play(play) for play in new_plays]
+            self._current_play_key = play_key(new_plays[-1])
+            self._current_play = parsed[-1]
+            return PLAY_CHANGED, parsed
+
+        except CircuitOpenError as e:
+            logger.debug(f"Skipping plays sync: {e}")
+            return PLAY_ERROR, []
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error syncing plays: {e}")
+            return PLAY_ERROR, []
 
     def get_show_details(self, show_id):
         """
         Get details about a specific show
+        Served from the show cache until the show's end_time, and from the
+        last good details (marked stale) while the API is failing
         """
-        try:
-            url = f"{self.BASE_URL}/shows/{show_id}/"
-
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+        cached = self.show_cache.get(show_id)
+        if cached is not None:
+            return cached
 
-            show = response.json()
+        try:
+            url = f"{self.base_url}/shows/{show_id}/"
+            response = self._get('shows', url)
+            return self._show_response(show_id, response.json())
 
-            return {
-                'program_name': show.get('program_name', 'KEXP'),
-                'program_tags': show.get('program_tags', ''),
-                'host_names': show.get('host_names', ''),
-                'start_time': show.get('start_time', ''),
-                'end_time': show.get('end_time', '')
-            }
+        except (CircuitOpenError, requests.exceptions.RequestException, ValueError) as e:
+            return self._show_failed(show_id, e)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching show details: {e}")
+    def _history_complete_window(self):
+        """Every play since the first sync (or the last gap) has been recorded"""
+        if self._synced_since is None or self._high_water_airdate is None:
             return None
+        return self._synced_since, self._high_water_airdate
 
-    def get_recent_plays(self, limit=10):
+    def get_recent_plays(self, limit=10, local=True):
         """
         Get recent plays from KEXP
+        Served from the local play history (unless local=False) when
+        sync_new_plays() has recorded every one of the `limit` newest plays,
+        otherwise fetched from the API (the last good plays marked stale if
+        the API is failing)
         """
+        if local:
+            plays = self._local_recent_plays(limit)
+            if plays is not None:
+                return plays
+
         try:
-            url = f"{self.BASE_URL}/plays/"
+            url = f"{self.base_url}/plays/"
             params = {
                 'limit': limit,
                 'ordering': '-airdate'
             }
+            response = self._get('plays', url, params=params)
+            return self._recent_plays_response(response.json())
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        except (CircuitOpenError, requests.exceptions.RequestException, ValueError) as e:
+            return self._recent_plays_failed(limit, e)
 
-            data = response.json()
+    def iter_plays(self, airdate_after=None, airdate_before=None, page_size=100,
+                   ordering='-airdate', min_request_interval=1.0, max_retries=5):
+        """
+        Stream plays from the plays endpoint, following pagination
+
+        Only one page is held in memory at a time, so long windows (e.g. a
+        week of plays) can be pulled with constant memory. Page requests are
+        spaced at least `min_request_interval` seconds apart and go through
+        the plays endpoint's backoff; a failed page is retried after the
+        backoff delay, up to `max_retries` times in a row.
+
+        Args:
+            airdate_after: Only plays after this time (datetime or ISO string)
+            airdate_before: Only plays before this time (datetime or ISO string)
+            page_size: Plays per request
+            ordering: '-airdate' (newest first) or 'airdate' (oldest first)
+
+        Yields:
+            Raw play dicts as returned by the API
+        """
+        url = f"{self.base_url}/plays/"
+        params = {
+            'limit': page_size,
+            'ordering': ordering
+        }
+        if airdate_after:
+            params['airdate_after'] = _format_airdate(airdate_after)
+        if airdate_before:
+            params['airdate_before'] = _format_airdate(airdate_before)
+
+        guard = self.guards['plays']
+        last_request = 0.0
+        failures = 0
+
+        while url:
+            wait = max(min_request_interval - (time.monotonic() - last_request),
+                       guard.retry_at - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            last_request = time.monotonic()
 
-            if data and 'results' in data:
-                return data['results']
+            try:
+                response = self._get('plays', url, params=params)
+                data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                failures += 1
+                if failures > max_retries:
+                    logger.error(f"Giving up on plays backfill after {max_retries} retries: {e}")
+                    return
+                logger.warning(f"Plays page failed ({e}), retrying")
+                continue
 
-            return []
+            failures = 0
+            results = data.get('results') or []
+            self._record_plays(results)
+            for play in results:
+                yield play
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching recent plays: {e}")
-            return []
+            # The next link already carries the query parameters
+            url = data.get('next')
+            params = None
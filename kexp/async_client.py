@@ -0,0 +1,182 @@
+"""
+Async KEXP API Client
+asyncio variant of KEXPClient over a pooled aiohttp session
+"""
+
+import asyncio
+import logging
+from kexp.api_client import BaseKEXPClient, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+    # Failures that fall back to the last good data; ValueError covers a
+    # malformed JSON body
+    REQUEST_ERRORS = (CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+except ImportError:
+    # The async client needs aiohttp; KEXPClient works without it
+    AIOHTTP_AVAILABLE = False
+
+
+class AsyncKEXPClient(BaseKEXPClient):
+    """
+    Async client for the KEXP API with the same methods as KEXPClient
+
+    A standalone API for asyncio code; the display itself polls with
+    KEXPClient on the fetcher thread.
+
+    All requests share one aiohttp session whose connection pool is capped
+    at `max_connections`, and every request (connect, send and read) must
+    finish within `timeout` seconds. Show details for several shows can be
+    fetched concurrently with get_many_show_details(); concurrent lookups
+    of the same show share a single request. Response handling, the show
+    cache, history recording and the per-endpoint backoff are the shared
+    BaseKEXPClient code, so they behave exactly as in KEXPClient.
+
+    Use it as an async context manager, or call close() when done.
+    """
+
+    def __init__(self, show_cache_size=32, history=None, max_connections=4, timeout=10,
+                 base_url=None):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("AsyncKEXPClient requires aiohttp (pip install aiohttp)")
+
+        super().__init__(show_cache_size, history, base_url)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+        # In-flight show requests, so concurrent lookups of one show share it
+        self._show_requests = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the session and its pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """The shared session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={'User-Agent': 'KEXP-Display/1.0'},
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def _get(self, endpoint, url, params=None, headers=None):
+        """
+        GET through the endpoint's backoff/circuit breaker
+
+        Returns:
+            Tuple of (status, response headers, decoded JSON or None for 304)
+
+        Raises CircuitOpenError without touching the network while the
+        endpoint is backing off. Connection errors, timeouts, 429 and 5xx
+        responses count as failures; other responses reset the backoff.
+        """
+        guard = self._guard(endpoint)
+
+        try:
+            async with self._get_session().get(url, params=params, headers=headers) as response:
+                self._record_response(guard, response.status, response)
+                response.raise_for_status()
+                if response.status == 304:
+                    return response.status, response.headers, None
+                return response.status, response.headers, await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            guard.record_failure()
+            raise
+
+    async def get_current_play(self):
+        """
+        Get the currently playing track from KEXP
+        (the last good play marked stale if the API is failing)
+        """
+        status, play = await self.poll_current_play()
+        return play
+
+    async def poll_current_play(self):
+        """
+        Check whether the current play has changed since the last poll
+
+        Returns:
+            Tuple of (status, play) as KEXPClient.poll_current_play()
+        """
+        try:
+            url = f"{self.base_url}/plays/"
+            response = await self._get('plays', url, self.CURRENT_PLAY_PARAMS,
+                                       self._current_play_headers())
+            return self._current_play_response(*response)
+        except REQUEST_ERRORS as e:
+            return self._current_play_failed(e)
+
+    async def get_show_details(self, show_id):
+        """
+        Get details about a specific show
+        Served from the show cache until the show's end_time, and from the
+        last good details (marked stale) while the API is failing
+        """
+        cached = self.show_cache.get(show_id)
+        if cached is not None:
+            return cached
+
+        request = self._show_requests.get(show_id)
+        if request is None:
+            request = asyncio.ensure_future(self._fetch_show_details(show_id))
+            self._show_requests[show_id] = request
+            request.add_done_callback(lambda _: self._show_requests.pop(show_id, None))
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(request)
+
+    async def get_many_show_details(self, show_ids):
+        """
+        Get details for several shows concurrently
+
+        Returns:
+            Dict of show_id -> details (or None if unavailable)
+        """
+        show_ids = list(dict.fromkeys(show_ids))
+        results = await asyncio.gather(*(self.get_show_details(show_id) for show_id in show_ids))
+        return dict(zip(show_ids, results))
+
+    async def _fetch_show_details(self, show_id):
+        """Fetch show details from the API and cache them"""
+        try:
+            url = f"{self.base_url}/shows/{show_id}/"
+            status, headers, show = await self._get('shows', url)
+            return self._show_response(show_id, show)
+        except REQUEST_ERRORS as e:
+            return self._show_failed(show_id, e)
+
+    async def get_recent_plays(self, limit=10, local=True):
+        """
+        Get recent plays from KEXP
+        (the last good plays marked stale if the API is failing)
+
+        Polling leaves gaps in the local history, so it only answers when
+        _history_complete_window() vouches for it
+        """
+        if local:
+            plays = self._local_recent_plays(limit)
+            if plays is not None:
+                return plays
+
+        try:
+            url = f"{self.base_url}/plays/"
+            params = {
+                'limit': limit,
+                'ordering': '-airdate'
+            }
+            status, headers, data = await self._get('plays', url, params)
+            return self._recent_plays_response(data)
+        except REQUEST_ERRORS as e:
+            return self._recent_plays_failed(limit, e)
@@ -0,0 +1,332 @@
+"""
+Snapshot Broadcast
+One poller publishes play snapshots; any number of local displays subscribe
+"""
+
+import os
+import json
+import time
+import socket
+import struct
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bump when the message layout changes; other versions are ignored
+BROADCAST_VERSION = 1
+
+# Largest snapshot that fits in a single UDP datagram
+MAX_DATAGRAM = 65000
+
+
+def parse_address(address):
+    """
+    Parse a broadcast address
+
+    'unix:/path/to/socket' is a Unix stream socket for processes on one
+    host; 'udp://239.1.2.3:5903' is a UDP multicast group for a LAN.
+
+    Returns:
+        ('unix', path) or ('udp', (group, port))
+    """
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        if path:
+            return 'unix', path
+    elif address.startswith('udp://'):
+        group, _, port = address[len('udp://'):].rpartition(':')
+        if group and port.isdigit():
+            return 'udp', (group, int(port))
+    raise ValueError(f"Invalid broadcast address {address!r} "
+                     f"(expected unix:/path or udp://group:port)")
+
+
+def encode_message(publisher_id, seq, snapshot):
+    """Serialize a snapshot for the wire (one line of JSON)"""
+    return (json.dumps({
+        'v': BROADCAST_VERSION,
+        'publisher': publisher_id,
+        'seq': seq,
+        'snapshot': snapshot,
+    }, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class SnapshotPublisher:
+    """
+    Sends every published play snapshot to subscribed display processes
+
+    Over a Unix socket, each subscriber gets the latest snapshot as soon as
+    it connects and every new one after that. Over UDP multicast there is
+    no connection, so the latest snapshot is also re-sent every
+    `heartbeat` seconds for subscribers that started late or lost a
+    datagram.
+    """
+
+    def __init__(self, address, heartbeat=5.0, multicast_ttl=1):
+        self.address = address
+        self.transport, self.target = parse_address(address)
+        self.heartbeat = heartbeat
+        # Lets subscribers tell a restarted publisher from an old message
+        self.publisher_id = f"{socket.gethostname()}:{os.getpid()}:{time.time():.0f}"
+
+        self._seq = 0
+        self._message = None
+        self._lock = threading.Lock()
+        self._clients = []
+        self._stop_event = threading.Event()
+        self._threads = []
+
+        if self.transport == 'unix':
+            self._server = self._listen_unix(self.target)
+            self._threads.append(threading.Thread(target=self._accept_loop,
+                                                  name='kexp-broadcast-accept', daemon=True))
+        else:
+            self._server = None
+            self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            self._udp.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, multicast_ttl)
+            # Deliver to subscribers on this host too
+            self._udp.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+            self._threads.append(threading.Thread(target=self._heartbeat_loop,
+                                                  name='kexp-broadcast-heartbeat', daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Publishing play snapshots on {address}")
+
+    @staticmethod
+    def _listen_unix(path):
+        """Bind the Unix socket, replacing a stale socket file from a dead publisher"""
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise OSError(f"Another publisher is already running on {path}")
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(16)
+        server.settimeout(1.0)
+        return server
+
+    def publish(self, snapshot):
+        """Send a snapshot to every subscriber"""
+        with self._lock:
+            self._seq += 1
+            self._message = encode_message(self.publisher_id, self._seq, snapshot)
+            message = self._message
+            if self.transport == 'unix':
+                self._send_to_clients(message)
+        if self.transport == 'udp':
+            self._send_datagram(message)
+
+    def _send_to_clients(self, message):
+        """Write a message to each connected subscriber, dropping dead ones (lock held)"""
+        alive = []
+        for client in self._clients:
+            try:
+                client.sendall(message)
+                alive.append(client)
+            except OSError as e:
+                logger.info(f"Dropping display subscriber: {e}")
+                client.close()
+        self._clients = alive
+
+    def _send_datagram(self, message):
+        """Send a message to the multicast group"""
+        if len(message) > MAX_DATAGRAM:
+            logger.warning(f"Snapshot of {len(message)} bytes is too large for one datagram")
+            return
+        try:
+            self._udp.sendto(message, self.target)
+        except OSError as e:
+            logger.error(f"Error sending snapshot to {self.address}: {e}")
+
+    def _accept_loop(self):
+        """Accept subscribers and bring each one up to date"""
+        while not self._stop_event.is_set():
+            try:
+                client, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # A stuck subscriber must not hold up the others
+            client.settimeout(0.5)
+            with self._lock:
+                if self._message is not None:
+                    try:
+                        client.sendall(self._message)
+                    except OSError:
+                        client.close()
+                        continue
+                self._clients.append(client)
+            logger.info(f"Display subscriber connected ({len(self._clients)} total)")
+
+    def _heartbeat_loop(self):
+        """Re-send the latest snapshot for late or lossy multicast subscribers"""
+        while not self._stop_event.wait(self.heartbeat):
+            with self._lock:
+                message = self._message
+            if message is not None:
+                self._send_datagram(message)
+
+    def close(self):
+        """Stop publishing and release the socket"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients = []
+        if self.transport == 'unix':
+            self._server.close()
+            try:
+                os.unlink(self.target)
+            except OSError:
+                pass
+        else:
+            self._udp.close()
+
+
+class SnapshotSubscriber(threading.Thread):
+    """
+    Receives play snapshots from a SnapshotPublisher
+
+    Has the same interface as PlayFetcher (start(), stop() and a lock-free
+    `snapshot` property), so a display process can render from it instead
+    of polling the API itself. Reconnects if the publisher goes away.
+    """
+
+    def __init__(self, address, reconnect_interval=2.0):
+        super().__init__(name='kexp-subscriber', daemon=True)
+        self.address = address
+        self.transport, self.target = parse_address(address)
+        self.reconnect_interval = reconnect_interval
+        self._snapshot = None
+        self._publisher = None
+        self._seq = 0
+        self._stop_event = threading.Event()
+        self._failing = False  # reported the current outage already
+        self.received = 0
+
+    @property
+    def snapshot(self):
+        """Latest received play snapshot (or None before the first one)"""
+        return self._snapshot
+
+    def run(self):
+        """Receive snapshots until stopped"""
+        logger.info(f"Subscribing to play snapshots on {self.address}")
+        while not self._stop_event.is_set():
+            try:
+                if self.transport == 'unix':
+                    self._receive_unix()
+                else:
+                    self._receive_udp()
+            except OSError as e:
+                self._failed(f"Snapshot subscription to {self.address} failed: {e}")
+            self._stop_event.wait(self.reconnect_interval)
+        logger.info("KEXP subscriber stopped")
+
+    def stop(self):
+        """Ask the subscriber thread to exit"""
+        self._stop_event.set()
+
+    def _failed(self, message):
+        """Warn about the first failure of an outage, then retry quietly"""
+        if self._failing:
+            logger.debug(message)
+            return
+        self._failing = True
+        logger.warning(f"{message} (retrying every {self.reconnect_interval:g}s)")
+
+    def _connected(self, message):
+        """Log a (re)connection and end the current outage"""
+        if self._failing:
+            message = f"{message} again"
+        self._failing = False
+        logger.info(message)
+
+    def _receive_unix(self):
+        """Read newline-delimited messages until the publisher disconnects"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.target)
+            sock.settimeout(1.0)
+            self._connected(f"Connected to publisher on {self.address}")
+            buffer = b''
+            while not self._stop_event.is_set():
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    self._failed("Publisher closed the connection")
+                    return
+                buffer += data
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    self._handle(line)
+
+    def _receive_udp(self):
+        """Join the multicast group and read one message per datagram"""
+        group, port = self.target
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP) as sock:
+            # Several displays on one host can listen on the same port
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, 'SO_REUSEPORT'):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(('', port))
+            membership = struct.pack('4s4s', socket.inet_aton(group), socket.inet_aton('0.0.0.0'))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            sock.settimeout(1.0)
+            self._connected(f"Joined multicast group {self.address}")
+            while not self._stop_event.is_set():
+                try:
+                    data = sock.recv(MAX_DATAGRAM + 1024)
+                except socket.timeout:
+                    continue
+                self._handle(data)
+
+    def _handle(self, data):
+        """Publish a received snapshot, never letting a bad message end the subscription"""
+        try:
+            self._apply(data)
+        except Exception as e:
+            logger.warning(f"Ignoring snapshot message that could not be applied: {e}")
+
+    def _apply(self, data):
+        """
+        Publish a received snapshot if it is newer than the current one
+
+        Anything on the network can send to a multicast group, so messages
+        of the wrong shape are dropped rather than trusted.
+        """
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning("Ignoring malformed snapshot message")
+            return
+        if not isinstance(message, dict) or message.get('v') != BROADCAST_VERSION:
+            return
+
+        publisher, seq = message.get('publisher'), message.get('seq', 0)
+        snapshot = message.get('snapshot')
+        if (not isinstance(publisher, str) or type(seq) is not int
+                or not isinstance(snapshot, (dict, type(None)))):
+            logger.warning("Ignoring malformed snapshot message")
+            return
+        if publisher == self._publisher and seq <= self._seq:
+            # Heartbeat repeat or reordered datagram
+            return
+        self._publisher, self._seq = publisher, seq
+
+        if snapshot:
+            self._snapshot = snapshot
+            self.received += 1
@@ -0,0 +1,158 @@
+"""
+Background Play Fetcher
+Polls the KEXP API off the render thread and publishes play snapshots
+"""
+
+import time
+import threading
+import logging
+from kexp.api_client import KEXPClient, PLAY_CHANGED, mark_stale
+from kexp.poll_scheduler import PollScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class PlayFetcher(threading.Thread):
+    """
+    Background thread that owns the KEXPClient and publishes play snapshots
+
+    Each snapshot is a fully built dict that is never mutated after it is
+    published. Publishing is a single reference assignment, so the render
+    loop can read `snapshot` at any time without locking and always sees
+    either the previous or the next complete snapshot.
+
+    With a StateCache, the last snapshot and the known show details are
+    restored on construction (the snapshot marked stale), so the display
+    has something to render before the first poll, and saved again each
+    time a new snapshot is published.
+
+    With a SnapshotPublisher, every new snapshot is also broadcast to
+    display processes subscribed to it.
+
+    `clock` and `speed` let a replayed play stream run faster than real
+    time: poll intervals are measured on `clock` and each wait is
+    `speed` times shorter.
+    """
+
+    def __init__(self, config, client=None, state_cache=None, publisher=None,
+                 clock=time.time, speed=1.0):
+        super().__init__(name='kexp-fetcher', daemon=True)
+        if not speed > 0:
+            raise ValueError(f"Speed must be positive, got {speed!r}")
+        self.config = config
+        self.kexp_client = client or KEXPClient(base_url=config.KEXP_API_BASE)
+        self.poll_scheduler = PollScheduler(
+            config.update_interval,
+            min_interval=config.poll_min_interval,
+            max_interval=config.poll_max_interval,
+            adaptive=config.adaptive_polling,
+            clock=clock
+        )
+        self.speed = speed
+        self._snapshot = None
+        self._stop_event = threading.Event()
+        self.state_cache = state_cache
+        self.publisher = publisher
+        if state_cache is not None:
+            self._restore_state()
+
+    @property
+    def snapshot(self):
+        """Latest published play snapshot (or None before the first fetch)"""
+        return self._snapshot
+
+    def fetch_new_data(self):
+        """Fetch latest data from KEXP API and publish it if the play changed"""
+        published = None
+        try:
+            if self.config.incremental_sync:
+                # Only plays newer than the last one seen, oldest first
+                status, plays = self.kexp_client.sync_new_plays()
+                for missed in plays[:-1]:
+                    self._log_play(missed, "Aired between polls")
+                play_data = plays[-1] if plays else self.kexp_client.current_play
+            else:
+                # Get current play (now playing); unchanged plays are short-circuited
+                # by the client using the play's stable identity
+                status, play_data = self.kexp_client.poll_current_play()
+
+            if play_data and (status == PLAY_CHANGED or self._snapshot is None):
+                snapshot = dict(play_data)
+
+                # Always fetch show details if we have a show ID
+                # This is used for color scheme selection
+                if play_data.get('show'):
+                    show_details = self.kexp_client.get_show_details(play_data['show'])
+                    logger.debug(f"Show cache: {self.kexp_client.show_cache.stats()}")
+                    if show_details:
+                        snapshot['show_name'] = show_details.get('program_name', 'KEXP')
+                        # host_names is a list, join it into a string
+                        host_names = show_details.get('host_names', [])
+                        if isinstance(host_names, list):
+                            snapshot['host_name'] = ', '.join(host_names) if host_names else ''
+                        else:
+                            snapshot['host_name'] = host_names or ''
+                        # Lets the poll scheduler wake up for the next show
+                        snapshot['show_end_time'] = show_details.get('end_time', '')
+
+                # Publish the finished snapshot with one atomic swap
+                self._snapshot = snapshot
+                published = snapshot
+                self._save_state(snapshot)
+                if self.publisher is not None:
+                    self.publisher.publish(snapshot)
+
+                self._log_play(snapshot, "Now playing")
+
+        except Exception as e:
+            logger.error(f"Error fetching data: {e}")
+
+        self.poll_scheduler.record_poll(published is not None, published)
+
+    def _restore_state(self):
+        """Warm-start the snapshot and show cache from the state cache"""
+        try:
+            state = self.state_cache.load()
+            if not state:
+                return
+
+            for show_id, expires_at, details in state['shows']:
+                self.kexp_client.show_cache.restore(show_id, expires_at, details)
+            if state['snapshot']:
+                # Shown until the first poll revalidates it
+                self._snapshot = mark_stale(state['snapshot'])
+        except Exception as e:
+            # A bad state file must never keep the display from starting
+            logger.error(f"Error restoring state cache: {e}")
+            return
+        logger.info(f"Restored last play and {len(state['shows'])} shows from state cache")
+
+    def _save_state(self, snapshot):
+        """Persist the snapshot and show cache for the next start"""
+        if self.state_cache is None:
+            return
+        try:
+            self.state_cache.save(snapshot, self.kexp_client.show_cache.entries())
+        except Exception as e:
+            logger.error(f"Error saving state cache: {e}")
+
+    @staticmethod
+    def _log_play(play, label):
+        """Log a play (or air break) with the given label"""
+        if play.get('play_type') == 'airbreak':
+            logger.info(f"Air break: {play.get('show_name', 'KEXP')}")
+        else:
+            show_name = play.get('show_name', 'KEXP')
+            logger.info(f"{label}: {play['artist']} - {play['song']} ({show_name})")
+
+    def run(self):
+        """Poll the API at the poll scheduler's interval until stopped"""
+        logger.info("KEXP fetcher started")
+        while not self._stop_event.is_set():
+            self.fetch_new_data()
+            self._stop_event.wait(self.poll_scheduler.next_interval() / self.speed)
+        logger.info("KEXP fetcher stopped")
+
+    def stop(self):
+        """Ask the fetcher thread to exit after its current request"""
+        self._stop_event.set()
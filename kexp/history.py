@@ -0,0 +1,223 @@
+"""
+Play History Store
+Local SQLite record of every play and show the poller has seen
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from kexp.show_cache import parse_api_time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    play_id TEXT PRIMARY KEY,
+    airdate TEXT NOT NULL,
+    airdate_ts REAL,
+    artist TEXT,
+    song TEXT,
+    album TEXT,
+    show_id INTEGER,
+    play_type TEXT,
+    comment TEXT,
+    is_local INTEGER,
+    thumbnail_uri TEXT
+);
+CREATE INDEX IF NOT EXISTS plays_airdate ON plays (airdate_ts);
+CREATE INDEX IF NOT EXISTS plays_show ON plays (show_id, airdate_ts);
+CREATE INDEX IF NOT EXISTS plays_artist ON plays (artist COLLATE NOCASE, airdate_ts);
+
+CREATE TABLE IF NOT EXISTS shows (
+    show_id INTEGER PRIMARY KEY,
+    program_name TEXT,
+    program_tags TEXT,
+    host_names TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    updated_at REAL
+);
+"""
+
+PLAY_COLUMNS = ('play_id', 'airdate', 'artist', 'song', 'album', 'show_id',
+                'play_type', 'comment', 'is_local', 'thumbnail_uri')
+
+
+class PlayHistory:
+    """
+    Embedded SQLite store of plays and shows
+
+    Accepts both raw plays from the API and the play dicts built by
+    KEXPClient. Queries return dicts shaped like the API's play results
+    (id, airdate, artist, song, album, show, ...), so they can stand in for
+    a network call. Plays older than `retention_days`, or beyond the newest
+    `max_plays`, are pruned periodically.
+    """
+
+    def __init__(self, path, retention_days=30, max_plays=100000, prune_interval=3600):
+        self.path = path
+        self.retention_days = retention_days
+        self.max_plays = max_plays
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+        # Written by the fetcher thread, read from wherever the client is used
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            # WAL keeps readers off the writer's back and is gentle on SD cards
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+        logger.info(f"Play history opened at {path}")
+
+    def record_plays(self, plays):
+        """Insert or update plays (raw API plays or KEXPClient play dicts)"""
+        rows = []
+        for play in plays:
+            play_id = play.get('play_id') or play.get('id') or play.get('airdate')
+            airdate = play.get('airdate')
+            if not play_id or not airdate:
+                continue
+            rows.append((
+                str(play_id), airdate, parse_api_time(airdate),
+                play.get('artist'), play.get('song'), play.get('album'),
+                play.get('show'), play.get('play_type'), play.get('comment'),
+                1 if play.get('is_local') else 0, play.get('thumbnail_uri'),
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO plays (play_id, airdate, airdate_ts, artist, song, album, "
+                "show_id, play_type, comment, is_local, thumbnail_uri) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self._maybe_prune()
+        return len(rows)
+
+    def record_play(self, play):
+        """Insert or update a single play"""
+        return self.record_plays([play])
+
+    def record_show(self, show_id, details):
+        """Insert or update show details"""
+        host_names = details.get('host_names', '')
+        if not isinstance(host_names, str):
+            host_names = json.dumps(host_names)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shows (show_id, program_name, program_tags, host_names, "
+                "start_time, end_time, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (show_id, details.get('program_name'), details.get('program_tags'), host_names,
+                 details.get('start_time'), details.get('end_time'), time.time())
+            )
+
+    def recent_plays(self, limit=10):
+        """Most recent plays, newest first"""
+        return self._query_plays("1", (), limit)
+
+    def plays_for_show(self, show_id, limit=100):
+        """Most recent plays in a show, newest first"""
+        return self._query_plays("show_id = ?", (show_id,), limit)
+
+    def plays_by_artist(self, artist, limit=100):
+        """Most recent plays by an artist (case-insensitive), newest first"""
+        return self._query_plays("artist = ? COLLATE NOCASE", (artist,), limit)
+
+    def plays_between(self, start, end, limit=1000):
+        """Plays with airdate in [start, end) (epoch seconds), newest first"""
+        return self._query_plays("airdate_ts >= ? AND airdate_ts < ?", (start, end), limit)
+
+    def get_show(self, show_id):
+        """Stored show details, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM shows WHERE show_id = ?", (show_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        details = dict(row)
+        host_names = details.get('host_names') or ''
+        if host_names.startswith('['):
+            try:
+                details['host_names'] = json.loads(host_names)
+            except ValueError:
+                pass
+        return details
+
+    def count(self):
+        """Number of stored plays"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM plays").fetchone()[0]
+
+    def prune(self, now=None):
+        """Delete plays outside the retention window and beyond max_plays"""
+        now = time.time() if now is None else now
+        cutoff = now - self.retention_days * 86400
+
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM plays WHERE airdate_ts < ?", (cutoff,)
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM plays WHERE play_id IN ("
+                "SELECT play_id FROM plays ORDER BY airdate_ts DESC LIMIT -1 OFFSET ?)",
+                (self.max_plays,)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM shows WHERE show_id NOT IN (SELECT DISTINCT show_id FROM plays "
+                "WHERE show_id IS NOT NULL) AND updated_at < ?", (cutoff,)
+            )
+
+        self._last_prune = now
+        if deleted:
+            logger.info(f"Pruned {deleted} plays from history")
+        return deleted
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _maybe_prune(self):
+        """Run prune() at most once per prune_interval"""
+        now = time.time()
+        if now - self._last_prune >= self.prune_interval:
+            self.prune(now)
+
+    def _query_plays(self, where, params, limit):
+        """Run a plays query and return API-shaped dicts"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(PLAY_COLUMNS)} FROM plays WHERE {where} "
+                f"ORDER BY airdate_ts DESC LIMIT ?",
+                params + (limit,)
+            ).fetchall()
+        return [self._row_to_play(row) for row in rows]
+
+    @staticmethod
+    def _row_to_play(row):
+        """Convert a plays row to the API's play result shape"""
+        play_id = row['play_id']
+        return {
+            'id': int(play_id) if play_id.isdigit() else play_id,
+            'airdate': row['airdate'],
+            'artist': row['artist'],
+            'song': row['song'],
+            'album': row['album'],
+            'show': row['show_id'],
+            'play_type': row['play_type'],
+            'comment': row['comment'],
+            'is_local': bool(row['is_local']),
+            'thumbnail_uri': row['thumbnail_uri'],
+        }
@@ -0,0 +1,142 @@
+"""
+Poll Scheduler
+Chooses how long the fetcher waits before its next poll of the KEXP API
+"""
+
+import time
+import logging
+from kexp.show_cache import parse_api_time
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Adaptive poll interval based on where we are in the current play
+
+    Plays change a few times per hour, so a fixed interval spends most
+    requests re-reading the same play. Instead, the scheduler polls at
+    `min_interval` right after a change, to catch a short play such as an
+    air break following it (for the first third of a typical air break
+    after one starts), and in the run-up to the expected end of the play.
+    In between it backs off towards `max_interval`, waiting a quarter of
+    the time left in a typical play so that a shorter one is still picked
+    up promptly. The next poll is never scheduled past the show's end_time,
+    where a change is almost certain.
+
+    With adaptive=False every interval is `base_interval`, which is also
+    the baseline that requests saved are reported against.
+    """
+
+    def __init__(self, base_interval, min_interval=5, max_interval=30, adaptive=True,
+                 typical_track=210, typical_airbreak=90, settle_window=15, end_window=20,
+                 report_interval=3600, clock=time.time):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max_interval
+        self.adaptive = adaptive
+        self.typical_track = typical_track
+        self.typical_airbreak = typical_airbreak
+        self.settle_window = settle_window
+        self.end_window = end_window
+        self.report_interval = report_interval
+        self._clock = clock
+
+        self._settle_until = None
+        self._play_started = None
+        self._play_length = typical_track
+        self._show_end = None
+
+        self._started = clock()
+        self._window_start = self._started
+        self._window_polls = 0
+
+        self.polls = 0
+        self.changes = 0
+
+    def record_poll(self, changed=False, play=None):
+        """
+        Note that a poll happened, and whether it published a new play
+
+        Args:
+            changed: True if the poll found a new play
+            play: The published play snapshot (airdate, play_type and
+                show_end_time are used)
+        """
+        now = self._clock()
+        self.polls += 1
+        self._window_polls += 1
+
+        if changed and play:
+            self.changes += 1
+            # Prefer the API's airdate as the start of the play, unless the
+            # clocks disagree enough to put it in the future
+            started = parse_api_time(play.get('airdate'))
+            self._play_started = started if started is not None and started <= now else now
+            if play.get('play_type') == 'airbreak':
+                self._play_length = self.typical_airbreak
+                self._settle_until = now + max(self.settle_window, self.typical_airbreak / 3)
+            else:
+                self._play_length = self.typical_track
+                self._settle_until = now + self.settle_window
+            self._show_end = parse_api_time(play.get('show_end_time'))
+
+        self._maybe_report(now)
+
+    def next_interval(self):
+        """Seconds to wait before the next poll"""
+        if not self.adaptive or self._play_started is None:
+            return self.base_interval
+
+        now = self._clock()
+        if now < self._settle_until:
+            return self.min_interval
+
+        remaining = self._play_started + self._play_length - now
+        if remaining <= 0:
+            # Longer than a typical play: keep the fixed cadence
+            interval = self.base_interval
+        elif remaining <= self.end_window:
+            interval = self.min_interval
+        else:
+            # Mid-track: close in on the expected end, so a short play is
+            # not slept through
+            interval = remaining / 4
+
+        if self._show_end is not None:
+            to_show_end = self._show_end - now
+            if -self.end_window <= to_show_end <= self.end_window:
+                interval = self.min_interval
+            elif to_show_end > 0:
+                interval = min(interval, to_show_end)
+
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def stats(self):
+        """Return poll counters and requests saved against the fixed interval"""
+        elapsed = self._clock() - self._started
+        baseline = elapsed / self.base_interval if self.base_interval else 0
+        saved = max(0.0, baseline - self.polls)
+        return {
+            'polls': self.polls,
+            'changes': self.changes,
+            'baseline_polls': int(baseline),
+            'saved': int(saved),
+            'saved_ratio': saved / baseline if baseline else 0.0,
+        }
+
+    def _maybe_report(self, now):
+        """Log polls against the fixed-interval baseline once per report interval"""
+        elapsed = now - self._window_start
+        if elapsed < self.report_interval or not self.base_interval:
+            return
+
+        baseline = elapsed / self.base_interval
+        saved = max(0.0, baseline - self._window_polls)
+        logger.info(
+            f"Poll stats: {self._window_polls} polls in the last {elapsed:.0f}s "
+            f"vs {baseline:.0f} at a fixed {self.base_interval}s interval "
+            f"({saved:.0f} saved, {saved / baseline:.0%})"
+        )
+        self._window_start = now
+        self._window_polls = 0
@@ -0,0 +1,337 @@
+"""
+Play Stream Record and Replay
+Captures what the KEXP API returned, with timestamps, and plays it back
+through the KEXPClient interface for reproducible end-to-end runs
+"""
+
+import gzip
+import json
+import time
+import bisect
+import logging
+import threading
+from collections import Counter
+from kexp.api_client import PLAY_CHANGED, PLAY_UNCHANGED, PLAY_ERROR, mark_stale
+from kexp.show_cache import ShowDetailsCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the event layout changes; recordings with another version are refused
+RECORDING_VERSION = 1
+
+
+def _open(path, mode):
+    """Open a recording as text, gzip-compressed if the name ends in .gz"""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class PlayRecorder:
+    """
+    Writes API responses to a JSON lines file (gzipped for a .gz path)
+
+    The first line is a header; every other line is one event with its
+    epoch time `t`:
+
+        {"type": "plays", "status": "changed", "plays": [...]}
+        {"type": "plays", "status": "error", "plays": []}
+        {"type": "show", "id": 61201, "details": {...}}
+
+    Only changes are written (new plays, API errors and recoveries, show
+    details that differ from the last recorded ones), so a broadcast day
+    is a few hundred lines.
+    """
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._shows = {}  # show_id -> last recorded details
+        self._failing = False
+        self.events = 0
+        self._file = _open(path, 'w')
+        self._write({'type': 'header', 'v': RECORDING_VERSION, 'started': clock()})
+        logger.info(f"Recording play stream to {path}")
+
+    def _write(self, event):
+        with self._lock:
+            self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+            self._file.flush()
+            self.events += 1
+
+    def record_plays(self, status, plays):
+        """Record a plays response; unchanged polls are not written"""
+        if status == PLAY_ERROR:
+            if self._failing:
+                return
+            self._failing = True
+            plays = []
+        elif status == PLAY_CHANGED:
+            self._failing = False
+        elif self._failing:
+            # First good response after errors: the API recovered
+            self._failing = False
+            plays = []
+        else:
+            return
+        self._write({'t': self._clock(), 'type': 'plays', 'status': status,
+                     'plays': [play for play in plays if play]})
+
+    def record_show(self, show_id, details):
+        """Record show details if they differ from the last recorded ones"""
+        if not details or details.get('stale') or self._shows.get(show_id) == details:
+            return
+        self._shows[show_id] = details
+        self._write({'t': self._clock(), 'type': 'show', 'id': show_id, 'details': details})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingClient:
+    """
+    Wraps a KEXPClient and records every play and show response it returns
+
+    Everything else (show_cache, history, guards, ...) is passed through
+    to the wrapped client, so it can stand in for it anywhere.
+    """
+
+    def __init__(self, client, recorder):
+        self.client = client
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def poll_current_play(self):
+        status, play = self.client.poll_current_play()
+        self.recorder.record_plays(status, [play] if status == PLAY_CHANGED else [])
+        return status, play
+
+    def get_current_play(self):
+        status, play = self.poll_current_play()
+        return play
+
+    def sync_new_plays(self, max_plays=50):
+        status, plays = self.client.sync_new_plays(max_plays)
+        self.recorder.record_plays(status, plays)
+        return status, plays
+
+    def get_show_details(self, show_id):
+        details = self.client.get_show_details(show_id)
+        self.recorder.record_show(show_id, details)
+        return details
+
+
+class Recording:
+    """
+    A loaded recording: distinct plays, show details and API outages,
+    each indexed by time
+
+    A recording cut off mid-write (the process was killed before the gzip
+    stream was closed, or in the middle of a line) is read up to the last
+    complete event.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.started = None
+        self.ended = None
+        self.play_times = []
+        self.plays = []  # distinct plays, in airing order
+        self._status_times = []
+        self._failing = []  # whether the API was failing from each status time on
+        self._shows = {}  # show_id -> ([times], [details])
+
+        seen = set()
+        for number, event in self._read_events(path):
+            kind = event.get('type')
+            if kind == 'header':
+                if event.get('v') != RECORDING_VERSION:
+                    raise ValueError(f"{path} is recording version {event.get('v')}, "
+                                     f"expected {RECORDING_VERSION}")
+                self.started = event.get('started')
+                continue
+            if self.started is None:
+                raise ValueError(f"{path} line {number}: event before the header")
+
+            t = event['t']
+            self.ended = t
+            if kind == 'plays':
+                self._status_times.append(t)
+                self._failing.append(event.get('status') == PLAY_ERROR)
+                for play in event.get('plays') or []:
+                    if play.get('play_id') in seen:
+                        continue
+                    seen.add(play.get('play_id'))
+                    self.play_times.append(t)
+                    self.plays.append(play)
+            elif kind == 'show':
+                times, details = self._shows.setdefault(str(event['id']), ([], []))
+                times.append(t)
+                details.append(event['details'])
+
+        if self.started is None:
+            raise ValueError(f"{path} is not a play stream recording")
+        if self.ended is None:
+            self.ended = self.started
+
+    @staticmethod
+    def _read_events(path):
+        """Yield (line number, event), stopping quietly at a truncated tail"""
+        with _open(path, 'r') as f:
+            number = 0
+            try:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        if line.endswith('\n'):
+                            raise ValueError(f"{path} line {number}: malformed event")
+                        # Last line was cut off mid-write
+                        logger.warning(f"{path}: ignoring incomplete last line {number}")
+                        return
+                    yield number, event
+            except EOFError:
+                # gzip stream never closed (process killed while recording)
+                logger.warning(f"{path}: recording ends without a gzip trailer after "
+                               f"line {number}, using the events read so far")
+
+    @property
+    def duration(self):
+        """Seconds from the start of the recording to its last event"""
+        return self.ended - self.started
+
+    def play_index(self, when):
+        """Index of the newest play seen at `when` (-1 if none yet)"""
+        return bisect.bisect_right(self.play_times, when) - 1
+
+    def failing(self, when):
+        """Whether the API was failing at `when`"""
+        index = bisect.bisect_right(self._status_times, when) - 1
+        return index >= 0 and self._failing[index]
+
+    def show_details(self, show_id, when):
+        """Show details as last recorded at `when` (the first recorded if not yet seen)"""
+        entry = self._shows.get(str(show_id))
+        if entry is None:
+            return None
+        times, details = entry
+        index = max(0, bisect.bisect_right(times, when) - 1)
+        return details[index]
+
+
+class ReplayClock:
+    """
+    Time in the recording
+
+    With a `speed`, it runs from `start` at `speed` times wall-clock time
+    (e.g. 60 replays an hour a minute). Without one, it only moves when
+    advanced, for fully deterministic runs.
+    """
+
+    def __init__(self, start, speed=None):
+        if speed is not None and not speed > 0:
+            raise ValueError(f"Replay speed must be positive, got {speed!r}")
+        self.speed = speed
+        self._start = start
+        self._offset = 0.0
+        self._wall_start = time.monotonic()
+
+    def advance(self, seconds):
+        """Move the clock forward"""
+        self._offset += seconds
+
+    def __call__(self):
+        elapsed = (time.monotonic() - self._wall_start) * self.speed if self.speed else 0.0
+        return self._start + self._offset + elapsed
+
+
+class ReplayClient:
+    """
+    Serves a Recording through the KEXPClient interface used by PlayFetcher
+
+    Each call answers with what the API returned at the current replay
+    time: the newest recorded play, the plays since the last sync, the
+    show details, or an error (with the last good play marked stale)
+    while the API was failing. Show details go through a ShowDetailsCache
+    on the replay clock, and `requests` counts the API requests a live
+    client would have made.
+    """
+
+    def __init__(self, recording, clock=None, show_cache_size=32):
+        self.recording = recording
+        self.clock = clock or ReplayClock(recording.started)
+        self.show_cache = ShowDetailsCache(max_entries=show_cache_size)
+        self.history = None
+        self.requests = Counter()
+        self._current_index = -1
+        self._synced_index = None
+
+    @property
+    def current_play(self):
+        """The newest play returned by poll_current_play() or sync_new_plays()"""
+        return self.recording.plays[self._current_index] if self._current_index >= 0 else None
+
+    def get_current_play(self):
+        status, play = self.poll_current_play()
+        return play
+
+    def poll_current_play(self):
+        """Like KEXPClient.poll_current_play(), at the replay time"""
+        now = self.clock()
+        self.requests['plays'] += 1
+        if self.recording.failing(now):
+            return PLAY_ERROR, mark_stale(self.current_play)
+
+        index = self.recording.play_index(now)
+        if index < 0:
+            return PLAY_UNCHANGED, None
+        if index == self._current_index:
+            return PLAY_UNCHANGED, self.current_play
+        self._current_index = index
+        return PLAY_CHANGED, self.current_play
+
+    def sync_new_plays(self, max_plays=50):
+        """Like KEXPClient.sync_new_plays(), at the replay time"""
+        now = self.clock()
+        self.requests['plays'] += 1
+        if self.recording.failing(now):
+            return PLAY_ERROR, []
+
+        index = self.recording.play_index(now)
+        if index < 0 or index == self._synced_index:
+            return PLAY_UNCHANGED, []
+
+        if self._synced_index is None:
+            # The first sync only establishes the high-water mark
+            first = index
+        else:
+            first = max(self._synced_index + 1, index - max_plays + 1)
+        self._synced_index = index
+        self._current_index = index
+        return PLAY_CHANGED, self.recording.plays[first:index + 1]
+
+    def get_show_details(self, show_id):
+        """Like KEXPClient.get_show_details(), cached on the replay clock"""
+        now = self.clock()
+        cached = self.show_cache.get(show_id, now=now)
+        if cached is not None:
+            return cached
+
+        self.requests['shows'] += 1
+        if self.recording.failing(now):
+            return mark_stale(self.show_cache.peek(show_id))
+        details = self.recording.show_details(show_id, now)
+        if details is not None:
+            self.show_cache.put(show_id, details, now=now)
+        return details
+
+    def get_recent_plays(self, limit=10, local=True):
+        """The newest recorded plays at the replay time, newest first"""
+        index = self.recording.play_index(self.clock())
+        return self.recording.plays[max(0, index - limit + 1):index + 1][::-1]
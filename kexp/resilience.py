@@ -0,0 +1,123 @@
+"""
+API Resilience
+Per-endpoint exponential backoff with jitter and a circuit breaker
+"""
+
+import time
+import random
+import logging
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of making a request while an endpoint is backing off"""
+
+
+class EndpointGuard:
+    """
+    Tracks failures for one API endpoint and decides when to try it again
+
+    Each consecutive failure doubles the wait before the next attempt (up to
+    `max_delay`), randomized between 50% and 100% of that delay so a fleet of
+    displays does not retry in lockstep. After `failure_threshold`
+    consecutive failures the circuit opens: requests fail fast without
+    touching the network until the wait expires, then a single trial request
+    is let through (half-open). A success closes the circuit again.
+    """
+
+    def __init__(self, name, base_delay=2.0, max_delay=300.0, failure_threshold=3,
+                 clock=time.monotonic, rng=random.random):
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self._clock = clock
+        self._rng = rng
+
+        self.failures = 0
+        self.retry_at = 0.0
+        self._trial_in_flight = False
+
+        self.requests = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """Current circuit state"""
+        if self.failures < self.failure_threshold:
+            return CIRCUIT_CLOSED
+        if self._clock() < self.retry_at:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
+    def allow(self):
+        """Return True if a request may be sent now"""
+        now = self._clock()
+        if now < self.retry_at:
+            self.rejected += 1
+            return False
+
+        if self.failures >= self.failure_threshold:
+            # Half-open: let exactly one trial request through
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+
+        self.requests += 1
+        return True
+
+    def record_success(self):
+        """Reset backoff and close the circuit"""
+        if self.failures >= self.failure_threshold:
+            logger.info(f"KEXP API {self.name}: circuit closed, requests succeeding again")
+        self.failures = 0
+        self.retry_at = 0.0
+        self._trial_in_flight = False
+
+    def record_failure(self, retry_after=None):
+        """
+        Back off after a failed request
+
+        Args:
+            retry_after: Seconds the server asked us to wait (e.g. 429 Retry-After)
+        """
+        self.failures += 1
+        self._trial_in_flight = False
+
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+        delay *= 0.5 + self._rng() * 0.5
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.retry_at = self._clock() + delay
+
+        if self.failures == self.failure_threshold:
+            logger.warning(f"KEXP API {self.name}: circuit opened after {self.failures} failures, "
+                           f"retrying in {delay:.0f}s")
+        elif self.failures > self.failure_threshold:
+            logger.warning(f"KEXP API {self.name}: trial request failed, retrying in {delay:.0f}s")
+
+    def stats(self):
+        """Return the circuit state and request counters"""
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'requests': self.requests,
+            'rejected': self.rejected,
+        }
+
+
+def retry_after_seconds(response):
+    """Parse a numeric Retry-After header, or None"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,112 @@
+"""
+Show Details Cache
+Bounded LRU cache for show details that expires entries at the show's end_time
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def parse_api_time(value):
+    """
+    Parse an ISO 8601 timestamp from the KEXP API into epoch seconds
+
+    Returns None if the value is missing or cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        # fromisoformat() only accepts a trailing 'Z' from Python 3.11
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        return parsed.timestamp()
+    except ValueError:
+        logger.warning(f"Could not parse API timestamp: {value}")
+        return None
+
+
+class ShowDetailsCache:
+    """
+    LRU cache of show details keyed by show id
+
+    A show stays the same for hours and across dozens of plays, so each entry
+    lives until the show's own end_time. Shows without a usable end_time fall
+    back to `default_ttl` seconds.
+    """
+
+    def __init__(self, max_entries=32, default_ttl=3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # show_id -> (expires_at, details)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, show_id, now=None):
+        """Return cached details for show_id, or None if missing or expired"""
+        now = time.time() if now is None else now
+        entry = self._entries.get(show_id)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, details = entry
+        if now >= expires_at:
+            # Expired entries stay (until evicted) as a stale fallback for peek()
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(show_id)
+        self.hits += 1
+        return details
+
+    def peek(self, show_id):
+        """Return details for show_id even if expired, without touching counters"""
+        entry = self._entries.get(show_id)
+        return entry[1] if entry is not None else None
+
+    def put(self, show_id, details, now=None):
+        """Store details for show_id, expiring at the show's end_time"""
+        now = time.time() if now is None else now
+        expires_at = parse_api_time(details.get('end_time'))
+        if expires_at is None or expires_at <= now:
+            expires_at = now + self.default_ttl
+
+        self._entries[show_id] = (expires_at, details)
+        self._entries.move_to_end(show_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def entries(self):
+        """Return (show_id, expires_at, details) for every entry, oldest first"""
+        return [(show_id, expires_at, details)
+                for show_id, (expires_at, details) in self._entries.items()]
+
+    def restore(self, show_id, expires_at, details):
+        """Re-insert an entry saved by entries(), keeping its original expiry"""
+        self._entries[show_id] = (expires_at, details)
+        self._entries.move_to_end(show_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+        }
+
+    def __len__(self):
+        return len(self._entries)
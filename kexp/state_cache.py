@@ -0,0 +1,119 @@
+"""
+Persistent State Cache
+Small on-disk copy of the last play snapshot and known shows for warm restarts
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes; files with another version are ignored
+STATE_VERSION = 1
+
+
+def _is_number(value):
+    """True for an int or float (bool excluded)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_show_entry(entry):
+    """True for a saved [show_id, expires_at, details] entry"""
+    return (isinstance(entry, list) and len(entry) == 3
+            and isinstance(entry[0], (int, str)) and _is_number(entry[1])
+            and isinstance(entry[2], dict))
+
+
+class StateCache:
+    """
+    JSON file holding the last published snapshot and cached show details
+
+    Writes go to a temporary file in the same directory which is then
+    renamed over the old one, so a crash or power loss mid-write leaves
+    either the previous or the new state, never a truncated file. Files
+    written by another STATE_VERSION, unreadable files and state older
+    than `max_age` seconds are ignored, as are a snapshot or show entries
+    of the wrong shape.
+    """
+
+    def __init__(self, path, max_age=24 * 3600):
+        self.path = path
+        self.max_age = max_age
+
+    def load(self, now=None):
+        """
+        Read the saved state
+
+        Returns:
+            Dict with 'snapshot' (or None) and 'shows' (a list of
+            [show_id, expires_at, details]), or None if there is no usable state
+        """
+        now = time.time() if now is None else now
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable state cache {self.path}: {e}")
+            return None
+
+        if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+            logger.info(f"Ignoring state cache {self.path} from another version")
+            return None
+        saved_at = state.get('saved_at')
+        if not _is_number(saved_at):
+            logger.warning(f"Ignoring state cache {self.path} without a save time")
+            return None
+        if now - saved_at > self.max_age:
+            logger.info(f"Ignoring state cache {self.path} older than {self.max_age}s")
+            return None
+
+        snapshot = state.get('snapshot')
+        if not isinstance(snapshot, dict):
+            snapshot = None
+        shows = state.get('shows')
+        if not isinstance(shows, list):
+            shows = []
+        valid = [entry for entry in shows if _is_show_entry(entry)]
+        if len(valid) < len(shows):
+            logger.warning(f"Ignoring {len(shows) - len(valid)} malformed show entries "
+                           f"in state cache {self.path}")
+
+        return {
+            'snapshot': snapshot,
+            'shows': valid,
+        }
+
+    def save(self, snapshot, shows=(), now=None):
+        """
+        Atomically replace the saved state
+
+        Args:
+            snapshot: The last published play snapshot
+            shows: Iterable of (show_id, expires_at, details) entries
+        """
+        state = {
+            'version': STATE_VERSION,
+            'saved_at': time.time() if now is None else now,
+            'snapshot': snapshot,
+            'shows': [list(entry) for entry in shows],
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.kexp_state.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
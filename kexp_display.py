@@ -5,9 +5,16 @@ Main application for displaying current show and now playing on RGB LED matrix
 """
 
 import time
+
+# Startup timing starts before the (comparatively slow) imports below
+_STARTED = time.perf_counter()
+
+import sys
+import signal
 import logging
+import threading
 from display.renderer import DisplayRenderer
-from kexp.api_client import KEXPClient
+from display.frame_scheduler import FrameScheduler
 from config import Config
 
 logging.basicConfig(
@@ -16,83 +23,187 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longer than an API request can take (10s timeout), so the fetcher is out
+# of any request before the stores it writes to are closed
+FETCHER_STOP_TIMEOUT = 15
+
+
+class StartupTimer:
+    """Per-phase startup timing, logged once the first frame is on screen"""
+
+    def __init__(self, started):
+        self._started = started
+        self._last = started
+        self.phases = []  # (name, seconds) in order
+        self.parallel = []  # (name, seconds) for work overlapping the phases
+
+    def mark(self, name):
+        """End the current phase"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def record_parallel(self, name, seconds):
+        """Record work that ran on another thread"""
+        self.parallel.append((name, seconds))
+
+    def report(self):
+        """Log the phase breakdown and total time to first frame"""
+        total = time.perf_counter() - self._started
+        phases = ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        parallel = ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.parallel)
+        logger.info(f"Startup: first frame after {total * 1000:.0f}ms ({phases}"
+                    + (f"; in parallel: {parallel}" if parallel else "") + ")")
+
 
 class KEXPDisplay:
     def __init__(self, config):
         self.config = config
-        self.kexp_client = KEXPClient()
-        self.renderer = DisplayRenderer(config)
-        self.current_play = None
-
-    def fetch_new_data(self):
-        """Fetch latest data from KEXP API"""
+        self.startup = StartupTimer(_STARTED)
+        self.startup.mark('imports')
+
+        # The matrix (and in fast start mode the splash logo) comes up before
+        # the API client and its dependencies are even imported
+        self.renderer = DisplayRenderer(config, defer_fonts=config.fast_start)
+        self.startup.mark('display')
+
+        self.history = None
+        self.publisher = None
+        self.recorder = None
+        self.scheduler = FrameScheduler(config.frame_rate)
+
+        if config.broadcast_mode == 'subscribe':
+            # Another process polls the API; render whatever it publishes
+            from kexp.broadcast import SnapshotSubscriber
+            self.fetcher = SnapshotSubscriber(config.broadcast_address)
+            self.startup.mark('subscriber')
+            return
+
+        if config.broadcast_mode == 'publish':
+            from kexp.broadcast import SnapshotPublisher
+            self.publisher = SnapshotPublisher(config.broadcast_address)
+
+        if config.replay_file:
+            # A recorded play stream instead of the API; nothing is saved
+            self.fetcher = self._replay_fetcher()
+            self.startup.mark('replay')
+            return
+
+        from kexp.api_client import KEXPClient
+        from kexp.fetcher import PlayFetcher
+        from kexp.state_cache import StateCache
+        self.startup.mark('client imports')
+
+        self.history = self._open_history()
+        self.startup.mark('history')
+
+        # Last play and shows from the previous run, rendered before the first poll
+        state_cache = StateCache(config.state_cache) if config.state_cache else None
+        client = KEXPClient(history=self.history, base_url=config.KEXP_API_BASE)
+        if config.record_file:
+            from kexp.replay import PlayRecorder, RecordingClient
+            self.recorder = PlayRecorder(config.record_file)
+            client = RecordingClient(client, self.recorder)
+        self.fetcher = PlayFetcher(config, client=client,
+                                   state_cache=state_cache, publisher=self.publisher)
+        self.startup.mark('state')
+
+    def _replay_fetcher(self):
+        """Fetcher fed from REPLAY_FILE at REPLAY_SPEED times real time"""
+        from kexp.fetcher import PlayFetcher
+        from kexp.replay import Recording, ReplayClient, ReplayClock
+
+        recording = Recording(self.config.replay_file)
+        speed = self.config.replay_speed
+        clock = ReplayClock(recording.started, speed=speed)
+        logger.info(f"Replaying {len(recording.plays)} plays over {recording.duration / 3600:.1f}h "
+                    f"from {self.config.replay_file} at {speed:g}x")
+        return PlayFetcher(self.config, client=ReplayClient(recording, clock=clock),
+                           publisher=self.publisher, clock=clock, speed=speed)
+
+    def _open_history(self):
+        """Open the local play history, or return None if disabled or unavailable"""
+        if not self.config.history_db:
+            return None
+        from kexp.history import PlayHistory
         try:
-            # Get current play (now playing)
-            play_data = self.kexp_client.get_current_play()
-
-            if play_data and play_data != self.current_play:
-                # Always fetch show details if we have a show ID
-                # This is used for color scheme selection
-                if play_data.get('show'):
-                    show_details = self.kexp_client.get_show_details(play_data['show'])
-                    if show_details:
-                        play_data['show_name'] = show_details.get('program_name', 'KEXP')
-                        # host_names is a list, join it into a string
-                        host_names = show_details.get('host_names', [])
-                        if isinstance(host_names, list):
-                            play_data['host_name'] = ', '.join(host_names) if host_names else ''
-                        else:
-                            play_data['host_name'] = host_names or ''
-
-                self.current_play = play_data
-
-                if play_data.get('play_type') == 'airbreak':
-                    logger.info(f"Air break: {play_data.get('show_name', 'KEXP')}")
-                else:
-                    show_name = play_data.get('show_name', 'KEXP')
-                    logger.info(f"Now playing: {play_data['artist']} - {play_data['song']} ({show_name})")
-
+            return PlayHistory(self.config.history_db,
+                               retention_days=self.config.history_retention_days)
         except Exception as e:
-            logger.error(f"Error fetching data: {e}")
+            logger.error(f"Could not open play history {self.config.history_db}: {e}")
+            return None
+
+    def _load_fonts(self):
+        """Load deferred fonts while the first API request is in flight"""
+        started = time.perf_counter()
+        self.renderer.load_fonts()
+        self.startup.record_parallel('fonts', time.perf_counter() - started)
 
     def run(self):
         """Main loop"""
         logger.info("KEXP Display started")
 
-        # Fetch initial data
-        self.fetch_new_data()
+        # Polling (or subscribing) runs on its own thread so network latency
+        # never stalls rendering
+        self.fetcher.start()
 
-        last_fetch_time = time.time()
-        frame_delay = 0.1  # 10 FPS
+        if self.renderer.fonts_loading:
+            threading.Thread(target=self._load_fonts, name='kexp-fonts', daemon=True).start()
+
+        self.scheduler.start()
+        first_frame = True
+        dropped = 0
 
         try:
             while True:
-                # Fetch new data periodically
-                current_time = time.time()
-                if current_time - last_fetch_time >= self.config.update_interval:
-                    self.fetch_new_data()
-                    last_fetch_time = current_time
+                # Only ever read the latest published snapshot
+                current_play = self.fetcher.snapshot
 
                 # Render current data (for scrolling animation)
-                if self.current_play:
+                if current_play:
+                    fonts_ready = not self.renderer.fonts_loading
                     try:
-                        self.renderer.render_now_playing(self.current_play)
+                        # Dropped frame slots still count towards scroll speed
+                        self.renderer.render_now_playing(current_play, frames=1 + dropped)
                     except Exception as e:
                         logger.error(f"Error in render loop: {e}")
                         # Continue running even if one frame fails
                         pass
 
-                time.sleep(frame_delay)
+                    if first_frame and fonts_ready:
+                        first_frame = False
+                        self.startup.mark('cached play' if current_play.get('stale') else 'first poll')
+                        self.startup.report()
+
+                # Sleep until the next frame deadline on the monotonic clock
+                dropped = self.scheduler.wait_for_next_frame()
 
         except KeyboardInterrupt:
             logger.info("KEXP Display stopped by user")
         except Exception as e:
             logger.error(f"Fatal error: {e}", exc_info=True)
         finally:
+            self.fetcher.stop()
+            self.fetcher.join(timeout=FETCHER_STOP_TIMEOUT)
+            if self.fetcher.is_alive():
+                logger.warning("Fetcher did not stop in time; closing anyway")
             self.renderer.cleanup()
+            if self.publisher is not None:
+                self.publisher.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.history is not None:
+                self.history.close()
+
+
+def _handle_sigterm(signum, frame):
+    """Shut down through the normal cleanup path when systemd stops the service"""
+    logger.info("KEXP Display stopped by SIGTERM")
+    sys.exit(0)
 
 
 def main():
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     config = Config()
     display = KEXPDisplay(config)
     display.run()
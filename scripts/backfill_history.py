@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Backfill the local play history from the KEXP API
+Streams the paginated plays endpoint into the SQLite history store
+"""
+
+import sys
+import math
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path to import the kexp package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from kexp.api_client import KEXPClient
+from kexp.history import PlayHistory
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_time(value):
+    """Parse an ISO 8601 argument, assuming UTC if no offset is given"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def main():
+    config = Config()
+
+    parser = argparse.ArgumentParser(description='Backfill the local KEXP play history')
+    parser.add_argument('--days', type=float, default=7,
+                        help='How many days back to fetch when --after is not given (default: 7)')
+    parser.add_argument('--after', type=parse_time, default=None,
+                        help='Only plays after this ISO 8601 time')
+    parser.add_argument('--before', type=parse_time, default=None,
+                        help='Only plays before this ISO 8601 time')
+    parser.add_argument('--db', default=config.history_db or 'kexp_history.db',
+                        help='History database path (default: HISTORY_DB)')
+    parser.add_argument('--page-size', type=int, default=100,
+                        help='Plays per request (default: 100)')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='Minimum seconds between page requests (default: 1.0)')
+    parser.add_argument('--with-shows', action='store_true',
+                        help='Also fetch details for every show seen')
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    after = args.after or now - timedelta(days=args.days)
+    # Keep the backfill window inside the retention window so it isn't pruned right away
+    window_days = (now - after).total_seconds() / 86400
+    retention_days = max(config.history_retention_days, math.ceil(window_days))
+    history = PlayHistory(args.db, retention_days=retention_days)
+    client = KEXPClient(history=history, base_url=config.KEXP_API_BASE)
+
+    logger.info(f"Backfilling plays after {after.isoformat()} into {args.db} "
+                f"(keeping {retention_days} days)")
+
+    count = 0
+    shows = set()
+    try:
+        # The client records each page into the history as it streams
+        for play in client.iter_plays(airdate_after=after, airdate_before=args.before,
+                                      page_size=args.page_size,
+                                      min_request_interval=args.interval):
+            count += 1
+            if args.with_shows and play.get('show') and play['show'] not in shows:
+                shows.add(play['show'])
+                client.get_show_details(play['show'])
+            if count % 1000 == 0:
+                logger.info(f"{count} plays so far (last airdate {play.get('airdate')})")
+    except KeyboardInterrupt:
+        logger.info("Interrupted")
+    finally:
+        logger.info(f"Backfilled {count} plays; history now holds {history.count()}")
+        history.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
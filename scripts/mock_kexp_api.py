@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Local mock of the KEXP API
+Replays recorded plays and shows on a looping timeline, with injectable
+latency, errors and timeouts, so the display can be developed and tested
+without the network
+"""
+
+import sys
+import json
+import time
+import random
+import bisect
+import logging
+import argparse
+import threading
+from pathlib import Path
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qs, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add parent directory to path to import the kexp package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from kexp.show_cache import parse_api_time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+# Ids of replayed plays, well clear of the recorded ones
+PLAY_ID_BASE = 900000000
+
+
+def format_time(epoch):
+    """Format epoch seconds like the API does (ISO 8601 with offset)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def load_fixtures(directory):
+    """
+    Load plays.json (a recorded plays page) and shows.json (show id -> show)
+
+    Returns:
+        (plays oldest first, {show_id: show})
+    """
+    directory = Path(directory)
+    with open(directory / 'plays.json', encoding='utf-8') as f:
+        data = json.load(f)
+    plays = data['results'] if isinstance(data, dict) else data
+    plays = sorted(plays, key=lambda play: parse_api_time(play.get('airdate')) or 0)
+
+    shows = {}
+    shows_path = directory / 'shows.json'
+    if shows_path.exists():
+        with open(shows_path, encoding='utf-8') as f:
+            shows = {str(show_id): show for show_id, show in json.load(f).items()}
+
+    if not plays:
+        raise ValueError(f"No plays in {directory / 'plays.json'}")
+    return plays, shows
+
+
+class PlayTimeline:
+    """
+    The recorded plays looped end to end, starting in the past
+
+    Play k of the timeline is fixture play k % n with a fresh id and an
+    airdate shifted to when it "airs" now. Each play lasts as long as the
+    gap to the next one in the recording (divided by `speed`), or exactly
+    `change_interval` seconds if given. The timeline starts one full loop
+    before `started`, so there is a recent history to page through.
+    """
+
+    def __init__(self, plays, change_interval=None, speed=1.0, started=None):
+        self.plays = plays
+        started = time.time() if started is None else started
+
+        airdates = [parse_api_time(play.get('airdate')) or 0 for play in plays]
+        durations = []
+        for index in range(len(plays)):
+            if change_interval:
+                durations.append(change_interval)
+            elif index + 1 < len(plays):
+                durations.append(max(1.0, airdates[index + 1] - airdates[index]) / speed)
+            else:
+                # Last recorded play: as long as an average one
+                recorded = [b - a for a, b in zip(airdates, airdates[1:])]
+                average = sum(recorded) / len(recorded) if recorded else 180
+                durations.append(max(1.0, average) / speed)
+
+        # Start of each fixture play within one loop of the timeline
+        self.offsets = [0.0]
+        for duration in durations[:-1]:
+            self.offsets.append(self.offsets[-1] + duration)
+        self.period = self.offsets[-1] + durations[-1]
+        self.origin = started - self.period
+
+    def start_of(self, k):
+        """Airtime (epoch seconds) of timeline play k"""
+        loop, index = divmod(k, len(self.plays))
+        return self.origin + loop * self.period + self.offsets[index]
+
+    def index_at(self, when):
+        """Timeline index of the play airing at `when` (-1 before the start)"""
+        if when < self.origin:
+            return -1
+        loop, position = divmod(when - self.origin, self.period)
+        index = bisect.bisect_right(self.offsets, position) - 1
+        return int(loop) * len(self.plays) + index
+
+    def play(self, k):
+        """Timeline play k as the API would return it"""
+        play = dict(self.plays[k % len(self.plays)])
+        play['id'] = PLAY_ID_BASE + k
+        play['airdate'] = format_time(self.start_of(k))
+        return play
+
+    def show_window(self, show_id, when):
+        """
+        Start and end (epoch seconds) of the run of `show_id` around `when`
+
+        The show spans its consecutive plays in the loop; None if the show
+        does not appear in it.
+        """
+        n = len(self.plays)
+        current = max(0, self.index_at(when))
+        loop_start = current - current % n
+        indexes = [index for index, play in enumerate(self.plays)
+                   if str(play.get('show')) == str(show_id)]
+        if not indexes:
+            return None
+        first, last = indexes[0], indexes[-1]
+        return self.start_of(loop_start + first), self.start_of(loop_start + last + 1)
+
+
+class MockKEXPAPI:
+    """
+    State and fault injection shared by the request handlers
+
+    Every request first waits `latency` (+- `jitter`) seconds. A fraction
+    `timeout_rate` of requests then hang for `timeout_delay` seconds (past
+    the client's timeout), and a fraction `error_rate` fail with a 503
+    (carrying Retry-After when `retry_after` is set).
+    """
+
+    def __init__(self, timeline, shows, latency=0.0, jitter=0.0, error_rate=0.0,
+                 timeout_rate=0.0, timeout_delay=30.0, retry_after=None, seed=None):
+        self.timeline = timeline
+        self.shows = shows
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = Counter()  # (endpoint, status) -> requests
+
+    def count(self, endpoint, status):
+        with self._lock:
+            self.counts[(endpoint, status)] += 1
+
+    def inject_fault(self):
+        """Sleep for the configured latency; return 'timeout', 'error' or None"""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+        if delay:
+            time.sleep(delay)
+        if roll < self.timeout_rate:
+            time.sleep(self.timeout_delay)
+            return 'timeout'
+        if roll < self.timeout_rate + self.error_rate:
+            return 'error'
+        return None
+
+    def plays_page(self, query, now):
+        """
+        The plays endpoint: limit, offset, ordering, airdate_after and
+        airdate_before work as on the real API
+
+        Returns:
+            (page dict, ETag of the newest play)
+        """
+        timeline = self.timeline
+        newest = timeline.index_at(now)
+        first, last = 0, newest
+
+        after = parse_api_time(query.get('airdate_after'))
+        if after is not None:
+            first = max(first, timeline.index_at(after) + 1)
+        before = parse_api_time(query.get('airdate_before'))
+        if before is not None:
+            last = min(last, timeline.index_at(before))
+            if last >= 0 and timeline.start_of(last) >= before:
+                last -= 1
+
+        limit = max(1, min(int(query.get('limit') or 20), 1000))
+        offset = max(0, int(query.get('offset') or 0))
+        total = max(0, last - first + 1)
+
+        if query.get('ordering') == 'airdate':
+            indexes = range(first + offset, min(last + 1, first + offset + limit))
+        else:
+            indexes = range(last - offset, max(first - 1, last - offset - limit), -1)
+
+        page = {
+            'next': offset + limit < total and dict(query, offset=offset + limit) or None,
+            'previous': offset > 0 and dict(query, offset=max(0, offset - limit)) or None,
+            'results': [timeline.play(k) for k in indexes],
+        }
+        return page, f'"play-{PLAY_ID_BASE + newest}"'
+
+    def show(self, show_id, now):
+        """The show endpoint, with start/end times moved onto the timeline"""
+        show = self.shows.get(str(show_id))
+        if show is None:
+            return None
+        show = dict(show)
+        window = self.timeline.show_window(show_id, now)
+        if window is not None:
+            show['start_time'], show['end_time'] = (format_time(t) for t in window)
+        return show
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Serves /v2/plays/ and /v2/shows/<id>/ from the shared MockKEXPAPI"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        api = self.server.api
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts[:2] == ['v2', 'plays'] and len(parts) == 2:
+            endpoint = 'plays'
+        elif parts[:2] == ['v2', 'shows'] and len(parts) == 3:
+            endpoint = 'shows'
+        else:
+            return self._send(None, 404, {'detail': 'Not found.'})
+
+        fault = api.inject_fault()
+        if fault == 'timeout':
+            # The client has long given up; don't bother answering
+            api.count(endpoint, 'timeout')
+            self.close_connection = True
+            return
+        if fault == 'error':
+            headers = {'Retry-After': str(api.retry_after)} if api.retry_after else {}
+            return self._send(endpoint, 503, {'detail': 'Injected error'}, headers)
+
+        now = time.time()
+        if endpoint == 'plays':
+            try:
+                page, etag = api.plays_page(query, now)
+            except ValueError:
+                return self._send(endpoint, 400, {'detail': 'Invalid query.'})
+            if self.headers.get('If-None-Match') == etag and not query.get('offset'):
+                return self._send(endpoint, 304, None, {'ETag': etag})
+            for link in ('next', 'previous'):
+                if page[link]:
+                    page[link] = self._url(url.path, page[link])
+            return self._send(endpoint, 200, page, {'ETag': etag})
+
+        show = api.show(parts[2], now)
+        if show is None:
+            return self._send(endpoint, 404, {'detail': 'Not found.'})
+        return self._send(endpoint, 200, show)
+
+    def _url(self, path, query):
+        """Absolute URL for a pagination link"""
+        host = self.headers.get('Host') or '%s:%s' % self.server.server_address[:2]
+        return f"http://{host}{path}?{urlencode(query)}"
+
+    def _send(self, endpoint, status, body, headers=None):
+        if endpoint is not None:
+            self.server.api.count(endpoint, status)
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded KEXP API fixtures locally')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8090,
+                        help='Port to listen on (default: 8090)')
+    parser.add_argument('--fixtures', default=str(FIXTURES_DIR),
+                        help='Directory with plays.json and shows.json (default: scripts/fixtures)')
+    parser.add_argument('--change-interval', type=float, default=None,
+                        help='Seconds per play (default: the recorded gaps between plays)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Play the recorded gaps this many times faster (default: 1.0)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every response (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Random +- seconds around --latency (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with a 503 (default: 0)')
+    parser.add_argument('--retry-after', type=int, default=None,
+                        help='Retry-After seconds sent with injected errors')
+    parser.add_argument('--timeout-rate', type=float, default=0.0,
+                        help='Fraction of requests that hang past the client timeout (default: 0)')
+    parser.add_argument('--timeout-delay', type=float, default=30.0,
+                        help='Seconds a hanging request stalls (default: 30)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for reproducible fault injection')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Log every request')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    plays, shows = load_fixtures(args.fixtures)
+    timeline = PlayTimeline(plays, change_interval=args.change_interval, speed=args.speed)
+    api = MockKEXPAPI(timeline, shows, latency=args.latency, jitter=args.jitter,
+                      error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                      timeout_delay=args.timeout_delay, retry_after=args.retry_after,
+                      seed=args.seed)
+
+    server = ThreadingHTTPServer((args.host, args.port), MockAPIHandler)
+    server.daemon_threads = True
+    server.api = api
+
+    logger.info(f"Replaying {len(plays)} plays and {len(shows)} shows "
+                f"(one loop every {timeline.period:.0f}s)")
+    logger.info(f"Serving on http://{args.host}:{args.port}/v2 "
+                f"(set KEXP_API_BASE=http://{args.host}:{args.port}/v2)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Interrupted")
+    finally:
+        server.server_close()
+        for (endpoint, status), count in sorted(api.counts.items(), key=str):
+            logger.info(f"{endpoint} {status}: {count} requests")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,7 @@ Fetches and displays current now playing information
 """
 
 import sys
+from config import Config
 from kexp.api_client import KEXPClient
 
 
@@ -13,7 +14,7 @@ def main():
     print("KEXP API Test")
     print("=" * 60)
 
-    client = KEXPClient()
+    client = KEXPClient(base_url=Config.KEXP_API_BASE)
 
     # Test getting current play
     print("\nFetching current play...")
@@ -42,6 +43,11 @@ def main():
                     print(f"  Host:      {show['host_names']}")
                 if show['start_time'] and show['end_time']:
                     print(f"  Time:      {show['start_time']} - {show['end_time']}")
+
+            # A second lookup should be served from the show cache
+            client.get_show_details(play['show'])
+            stats = client.show_cache.stats()
+            print(f"  Cache:     {stats['hits']} hit(s), {stats['misses']} miss(es)")
     else:
         print("\nError: Could not fetch current play data")
         print("This could be due to:")